@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Pre-compress static assets for the web app
+Writes a .gz next to each text asset in public/ so the server can send it
+as-is instead of gzipping on every request
+"""
+
+import gzip
+from pathlib import Path
+
+# Text formats worth compressing; images are already compressed
+COMPRESSIBLE_SUFFIXES = {'.html', '.css', '.js', '.json', '.svg', '.txt', '.xml'}
+
+# Files smaller than this aren't worth a separate .gz
+MIN_SIZE = 1000
+
+def precompress(public_dir: Path) -> int:
+    """Write up-to-date .gz files for compressible assets, returning how many were written"""
+    written = 0
+    
+    for path in public_dir.rglob('*'):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        
+        stat_result = path.stat()
+        if stat_result.st_size < MIN_SIZE:
+            continue
+        
+        gz_path = path.with_name(path.name + '.gz')
+        if gz_path.exists() and gz_path.stat().st_mtime >= stat_result.st_mtime:
+            continue
+        
+        gz_path.write_bytes(gzip.compress(path.read_bytes(), compresslevel=9))
+        written += 1
+    
+    return written
+
+if __name__ == '__main__':
+    public_dir = Path(__file__).parent.parent / 'public'
+    count = precompress(public_dir)
+    print(f"✅ Pre-compressed {count} assets in {public_dir}")
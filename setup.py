@@ -5,6 +5,33 @@ import os
 import sys
 import subprocess
 import shutil
+import hashlib
+import importlib.util
+
+# Hash of the requirements (and interpreter) last installed successfully
+REQUIREMENTS_STAMP = os.path.join('cache', 'requirements.sha256')
+
+def install_requirements():
+    """Install requirements.txt, skipping pip when nothing changed since the last install"""
+    with open('requirements.txt', 'rb') as f:
+        digest = hashlib.sha256(f.read() + sys.executable.encode()).hexdigest()
+    
+    if os.path.exists(REQUIREMENTS_STAMP):
+        with open(REQUIREMENTS_STAMP, 'r', encoding='utf-8') as f:
+            if f.read() == digest:
+                print("Requirements unchanged since last install, skipping pip")
+                return
+    
+    result = subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
+    if result.returncode == 0:
+        with open(REQUIREMENTS_STAMP, 'w', encoding='utf-8') as f:
+            f.write(digest)
+
+def ensure_test_runner():
+    """Install pytest-xdist if missing; pytest.ini passes -n, which fails without it"""
+    if importlib.util.find_spec('xdist') is None:
+        print("pytest-xdist not found, installing it")
+        subprocess.run([sys.executable, '-m', 'pip', 'install', 'pytest-xdist>=3.3.0'])
 
 def setup_project():
     """Set up the project environment"""
@@ -23,7 +50,8 @@ def setup_project():
     
     # Install Python dependencies
     print("\nInstalling Python dependencies...")
-    subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
+    install_requirements()
+    ensure_test_runner()
     
     # Create initial news.json file
     if not os.path.exists('public/data/news.json'):
@@ -40,7 +68,7 @@ def setup_project():
     print("1. Install Ollama from https://ollama.ai (optional for AI features)")
     print("2. Pull the llama3.2 model: ollama pull llama3.2")
     print("3. Run the enhanced service: python fetch_news_with_categories.py")
-    print("4. Run tests using: python -m unittest discover tests")
+    print("4. Run tests using: python -m pytest")
     print("5. Start the development server: python src/webapp.py")
     print("6. In a separate terminal, start news updates: python src/update_news.py")
 
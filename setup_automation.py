@@ -54,24 +54,21 @@ class NewsAutomationService:
         try:
             # Check if there are any changes to news files (both old and new format)
             news_files = ['public/data/news_latest.json', 'public/data/news.json']
-            changes_detected = False
             
-            for news_file in news_files:
-                result = subprocess.run(['git', 'status', '--porcelain', news_file], 
-                                      capture_output=True, text=True, cwd=self.project_path)
-                if result.stdout.strip():
-                    print(f"Detected changes in {news_file}: {result.stdout.strip()}")
-                    changes_detected = True
-            
-            if not changes_detected:
+            # One git call for all files rather than one per file
+            result = subprocess.run(['git', 'status', '--porcelain', *news_files], 
+                                  capture_output=True, text=True, cwd=self.project_path)
+            if not result.stdout.strip():
                 print("No changes to news data - skipping deployment")
                 return
+            print(f"Detected changes in news data:\n{result.stdout.rstrip()}")
             
             # Add both news files (enhanced service creates news_latest.json)
-            for news_file in news_files:
-                if os.path.exists(os.path.join(self.project_path, news_file)):
-                    subprocess.run(['git', 'add', news_file], 
-                                 cwd=self.project_path, check=True)
+            existing_files = [news_file for news_file in news_files
+                              if os.path.exists(os.path.join(self.project_path, news_file))]
+            if existing_files:
+                subprocess.run(['git', 'add', *existing_files], 
+                             cwd=self.project_path, check=True)
             
             # Check if there's actually something to commit
             result = subprocess.run(['git', 'diff', '--cached', '--quiet'], 
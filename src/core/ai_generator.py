@@ -6,26 +6,39 @@ from typing import Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# AI results kept per generator, so an article seen again (e.g. in a later
+# fetch, or from a second provider) isn't sent to Ollama twice
+_SUMMARY_CACHE_SIZE = 256
+
 class AIGenerator:
     def __init__(self):
         self.ollama_url = 'http://localhost:11434/api/generate'
         self.model = os.getenv('OLLAMA_MODEL', 'llama2')
         self.max_retries = 3
-
-    def _make_ollama_request(self, prompt: str, max_tokens: int = 150) -> Optional[str]:
+        # One keep-alive connection to Ollama instead of a new one per request
+        self._session = requests.Session()
+        # (title, description, content, category) -> summarize_article result
+        self._summary_cache: Dict[tuple, Tuple[str, str, bool, bool]] = {}
+
+    def _make_ollama_request(self, prompt: str, max_tokens: int = 150, json_format: bool = False) -> Optional[str]:
+        payload = {
+            'model': self.model,
+            'prompt': prompt,
+            'stream': False,
+            'options': {
+                'num_predict': max_tokens,
+                'temperature': 0.7
+            }
+        }
+        if json_format:
+            # Constrain the model to emit a single JSON object
+            payload['format'] = 'json'
+        
         for attempt in range(self.max_retries):
             try:
-                response = requests.post(
+                response = self._session.post(
                     self.ollama_url,
-                    json={
-                        'model': self.model,
-                        'prompt': prompt,
-                        'stream': False,
-                        'options': {
-                            'num_predict': max_tokens,
-                            'temperature': 0.7
-                        }
-                    },
+                    json=payload,
                     timeout=30
                 )
                 response.raise_for_status()
@@ -37,6 +50,14 @@ class AIGenerator:
                     return None
                 continue
 
+    def _parse_combined_response(self, response: str) -> Optional[Dict[str, Any]]:
+        """Parse the single-prompt JSON reply, or None if it isn't a JSON object"""
+        try:
+            data = json.loads(response)
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
     def _calculate_summary_length(self, text_length: int) -> int:
         if text_length <= 500:  # Short articles
             return 100
@@ -101,41 +122,54 @@ class AIGenerator:
             description = article.get('description', '')
             content = article.get('content', '')
             api_category = article.get('category', '').lower() if article.get('category') else ''
+            
+            cache_key = (title, description, content, api_category)
+            cached = self._summary_cache.get(cache_key)
+            if cached:
+                return cached
 
             # Combine available text and calculate length
             full_text = f'Title: {title}\n\nDescription: {description}\n\nContent: {content}'
             text_length = len(full_text.split())
             target_length = self._calculate_summary_length(text_length)
 
-            # Create prompts
-            summary_prompt = (
+            # One request returns summary, category and breaking flag together
+            combined_prompt = (
                 f'Please provide a comprehensive summary of this news article in {target_length} words. '
                 'Include key details, context, and implications. '
                 'Make sure the summary gives readers a complete understanding of: '
                 '1. What happened or was announced '
                 '2. Why it\'s important or its potential impact '
                 '3. Key background or context needed to understand the news '
-                '4. Any significant conclusions or next steps\n\n'
-                f'{full_text}'
-            )
-
-            category_prompt = (
-                'Based on this article, classify it into exactly ONE of these categories: '
-                'technology, business, science, world, general. '
-                'Respond with ONLY the category name in lowercase:\n\n'
-                f'{full_text}'
-            )
-
-            breaking_prompt = (
-                'Analyze if this is breaking news based on its urgency, significance, and impact. '
-                'Consider factors like immediate public interest, major developments, or significant events. '
-                'Respond with ONLY true or false:\n\n'
+                '4. Any significant conclusions or next steps. '
+                'Also classify it into exactly ONE of these categories: '
+                'technology, business, science, world, general, '
+                'and decide if it is breaking news based on its urgency, significance, and impact. '
+                'Respond with ONLY a JSON object of the form '
+                '{"summary": "...", "category": "...", "breaking": true or false}:\n\n'
                 f'{full_text}'
             )
 
             # Get AI responses with appropriate token limits
             target_tokens = target_length * 2  # Approximate tokens for target word count
-            summary = self._make_ollama_request(summary_prompt, max_tokens=target_tokens)
+            ai_category = None
+            combined_response = self._make_ollama_request(
+                combined_prompt, max_tokens=target_tokens + 50, json_format=True
+            )
+            combined = self._parse_combined_response(combined_response) if combined_response else None
+
+            if combined is not None:
+                summary = str(combined.get('summary') or '').strip()
+                ai_category = str(combined.get('category') or '').strip()
+                breaking_response = str(combined.get('breaking', '')).strip()
+            elif combined_response:
+                # The model answered but not with usable JSON; ask for each field separately
+                summary, ai_category, breaking_response = self._request_fields_separately(
+                    full_text, target_length, target_tokens, api_category
+                )
+            else:
+                summary = breaking_response = None
+
             if not summary or len(summary.split()) < target_length * 0.8:  # If summary is too short
                 summary = description
 
@@ -146,31 +180,75 @@ class AIGenerator:
             # 1. Try API category first
             if api_category and api_category in valid_categories:
                 final_category = api_category
+            # 2. Try AI categorization
+            elif ai_category and ai_category.lower() in valid_categories:
+                final_category = ai_category.lower()
             else:
-                # 2. Try AI categorization
-                ai_category = self._make_ollama_request(category_prompt, max_tokens=50)
-                if ai_category and ai_category.lower() in valid_categories:
-                    final_category = ai_category.lower()
-                else:
-                    # 3. Use keyword analysis as fallback
-                    detected_category = self._detect_category_from_content(full_text)
-                    if detected_category in valid_categories:
-                        final_category = detected_category
+                # 3. Use keyword analysis as fallback
+                detected_category = self._detect_category_from_content(full_text)
+                if detected_category in valid_categories:
+                    final_category = detected_category
 
             # Get breaking news status
-            breaking_response = self._make_ollama_request(breaking_prompt, max_tokens=50)
             is_breaking = breaking_response.lower() == 'true' if breaking_response else False
 
             # Log category determination process
             logger.info(f"Category determination for '{title[:50]}...': "
-                       f"API={api_category}, AI={ai_category if 'ai_category' in locals() else 'N/A'}, "
+                       f"API={api_category}, AI={ai_category or 'N/A'}, "
                        f"Final={final_category}")
 
             # Determine if AI successfully enhanced the article
             ai_enhanced = bool(summary and summary != description)
+            result = (summary, final_category, is_breaking, ai_enhanced)
             
-            return summary, final_category, is_breaking, ai_enhanced
+            # Only AI results are reused; fallbacks are retried next time
+            if ai_enhanced:
+                if len(self._summary_cache) >= _SUMMARY_CACHE_SIZE:
+                    self._summary_cache.pop(next(iter(self._summary_cache)))
+                self._summary_cache[cache_key] = result
+            
+            return result
 
         except Exception as e:
             logger.error(f'Error in AI processing: {str(e)}')
             return description, 'general', False, False
+
+    def _request_fields_separately(
+        self, full_text: str, target_length: int, target_tokens: int, api_category: str
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Fallback for models that don't follow the JSON format: one request per field.
+        
+        The category is only requested when the API didn't supply a usable one.
+        """
+        summary_prompt = (
+            f'Please provide a comprehensive summary of this news article in {target_length} words. '
+            'Include key details, context, and implications. '
+            'Make sure the summary gives readers a complete understanding of: '
+            '1. What happened or was announced '
+            '2. Why it\'s important or its potential impact '
+            '3. Key background or context needed to understand the news '
+            '4. Any significant conclusions or next steps\n\n'
+            f'{full_text}'
+        )
+
+        category_prompt = (
+            'Based on this article, classify it into exactly ONE of these categories: '
+            'technology, business, science, world, general. '
+            'Respond with ONLY the category name in lowercase:\n\n'
+            f'{full_text}'
+        )
+
+        breaking_prompt = (
+            'Analyze if this is breaking news based on its urgency, significance, and impact. '
+            'Consider factors like immediate public interest, major developments, or significant events. '
+            'Respond with ONLY true or false:\n\n'
+            f'{full_text}'
+        )
+
+        summary = self._make_ollama_request(summary_prompt, max_tokens=target_tokens)
+        ai_category = None
+        if api_category not in ('technology', 'business', 'science', 'world', 'general'):
+            ai_category = self._make_ollama_request(category_prompt, max_tokens=50)
+        breaking_response = self._make_ollama_request(breaking_prompt, max_tokens=50)
+        return summary, ai_category, breaking_response
@@ -2,7 +2,8 @@
 Category analyzer for news articles with priority-based detection
 """
 import re
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from collections import Counter
 
 class CategoryAnalyzer:
@@ -118,20 +119,8 @@ class CategoryAnalyzer:
         Returns:
             Detected category or None if uncertain
         """
-        # Combine all relevant text fields
-        text = ' '.join(filter(None, [
-            article.get('title', ''),
-            article.get('description', ''),
-            article.get('content', '')
-        ])).lower()
-        
         # Count matches for each category
-        category_scores = Counter()
-        
-        for category, patterns in cls.CATEGORY_PATTERNS.items():
-            for pattern in patterns:
-                matches = len(re.findall(pattern, text, re.IGNORECASE))
-                category_scores[category] += matches
+        category_scores = Counter(dict(cls._score_text(cls._article_text(article))))
                 
         # Return category with highest score if it meets threshold
         if category_scores:
@@ -152,25 +141,70 @@ class CategoryAnalyzer:
         Returns:
             Dictionary of category:confidence_score pairs
         """
-        text = ' '.join(filter(None, [
-            article.get('title', ''),
-            article.get('description', ''),
-            article.get('content', '')
-        ])).lower()
-        
-        scores = {}
-        total_matches = 0
-        
         # Count matches for each category
-        for category, patterns in cls.CATEGORY_PATTERNS.items():
-            category_matches = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, text, re.IGNORECASE))
-                category_matches += matches
-                total_matches += matches
-            scores[category] = category_matches
+        scores = dict(cls._score_text(cls._article_text(article)))
+        total_matches = sum(scores.values())
             
         # Convert to confidence scores
         if total_matches > 0:
             return {k: v/total_matches for k, v in scores.items()}
         return {k: 0.0 for k in cls.CATEGORY_PATTERNS.keys()}
+
+    @staticmethod
+    def _article_text(article: Dict[str, Any]) -> str:
+        """Combine all relevant text fields into lowercase text for matching"""
+        return ' '.join(filter(None, [
+            article.get('title', ''),
+            article.get('description', ''),
+            article.get('content', '')
+        ])).lower()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _score_text(text: str) -> Tuple[Tuple[str, int], ...]:
+        """
+        Count pattern matches per category
+        
+        Cached on the text so get_category and get_confidence_scores on the
+        same article share one scan.
+        """
+        counts = dict.fromkeys(CategoryAnalyzer.CATEGORY_PATTERNS, 0)
+        for term in _TERM_RE.findall(text):
+            for category in _TERM_CATEGORIES[term]:
+                counts[category] += 1
+        return tuple(counts.items())
+
+def _build_term_index(category_patterns: Dict[str, List[str]]) -> Tuple[re.Pattern, Dict[str, Tuple[str, ...]]]:
+    """
+    Flatten the per-category word-boundary alternations into one regex
+    
+    Text is scanned once instead of once per pattern. Each matched term maps
+    to every category whose patterns contain it, plus the categories of
+    shorter terms nested inside it (e.g. 'health' within 'mental health'),
+    so counts match scanning each pattern separately.
+    """
+    direct: Dict[str, List[str]] = {}
+    for category, patterns in category_patterns.items():
+        for pattern in patterns:
+            for term in _ALTERNATION_RE.fullmatch(pattern).group(1).split('|'):
+                direct.setdefault(term.lower(), []).append(category)
+    
+    term_categories = {}
+    for term, categories in direct.items():
+        nested = [
+            category
+            for other, other_categories in direct.items()
+            if other != term and re.search(r'\b' + re.escape(other) + r'\b', term)
+            for category in other_categories
+        ]
+        term_categories[term] = tuple(categories + nested)
+    
+    # Longest first so phrases win over any shorter alternative at the same position
+    alternation = '|'.join(re.escape(term) for term in sorted(term_categories, key=len, reverse=True))
+    return re.compile(r'\b(?:' + alternation + r')\b'), term_categories
+
+# Inner alternation of a CATEGORY_PATTERNS entry
+_ALTERNATION_RE = re.compile(r'\\b\((.*)\)\\b')
+
+# Single-pass matcher over lowercase text and term -> categories lookup
+_TERM_RE, _TERM_CATEGORIES = _build_term_index(CategoryAnalyzer.CATEGORY_PATTERNS)
@@ -3,16 +3,30 @@ Health monitoring for the news automation system
 """
 import os
 import json
+import atexit
+import threading
+import weakref
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds state changes are held in memory so a burst of them is written once
+_FLUSH_DELAY = 1.0
+
+# Monitors with unflushed state, flushed on interpreter exit
+_live_monitors = weakref.WeakSet()
+
 class HealthMonitor:
-    def __init__(self, state_file: str = "health_state.json"):
+    def __init__(self, state_file: str = "health_state.json", flush_delay: float = _FLUSH_DELAY):
         self.state_file = state_file
         self.state = self._load_state()
+        self.flush_delay = flush_delay
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer = None
+        _live_monitors.add(self)
         
     def _load_state(self) -> Dict[str, Any]:
         """Load health state from file."""
@@ -30,52 +44,89 @@ class HealthMonitor:
             'consecutive_failures': 0,
             'total_success': 0,
             'total_failures': 0,
-            'component_status': {}
+            'component_status': {},
+            'provider_scores': {}
         }
         
-    def _save_state(self):
-        """Save health state to file."""
+    def _save_state(self) -> bool:
+        """Save health state to file, returning whether the write succeeded."""
         try:
             with open(self.state_file, 'w') as f:
                 json.dump(self.state, f, indent=2)
+            return True
         except Exception as e:
             logger.error(f"Error saving health state: {str(e)}")
+            return False
+            
+    def _schedule_save(self):
+        """Mark the state changed and write it after flush_delay, unless a write is already pending.
+        
+        Callers must hold _lock.
+        """
+        self._dirty = True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+                
+    def flush(self):
+        """Write pending state changes to file now."""
+        with self._lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            # Stays dirty on a failed write, so the next flush tries again
+            if self._dirty and self._save_state():
+                self._dirty = False
             
     def update_component(self, component: str, status: str, error: Optional[str] = None):
         """Update status of a specific component."""
-        self.state['component_status'][component] = {
-            'status': status,
-            'last_update': datetime.now().isoformat(),
-            'error': error
-        }
-        self._save_state()
+        with self._lock:
+            self.state['component_status'][component] = {
+                'status': status,
+                'last_update': datetime.now().isoformat(),
+                'error': error
+            }
+            self._schedule_save()
+        
+    def get_provider_scores(self) -> Dict[str, Dict[str, float]]:
+        """Get the persisted per-provider scores."""
+        with self._lock:
+            return dict(self.state.get('provider_scores', {}))
+        
+    def update_provider_scores(self, scores: Dict[str, Dict[str, float]]):
+        """Persist per-provider scores so provider ordering survives restarts."""
+        with self._lock:
+            self.state['provider_scores'] = scores
+            self._schedule_save()
         
     def record_health_check(self, success: bool, details: Optional[Dict[str, Any]] = None):
         """Record the result of a health check."""
-        now = datetime.now()
-        self.state['last_check'] = now.isoformat()
+        with self._lock:
+            now = datetime.now()
+            self.state['last_check'] = now.isoformat()
         
-        if success:
-            self.state['last_success'] = now.isoformat()
-            self.state['consecutive_failures'] = 0
-            self.state['total_success'] += 1
-        else:
-            self.state['consecutive_failures'] += 1
-            self.state['total_failures'] += 1
+            if success:
+                self.state['last_success'] = now.isoformat()
+                self.state['consecutive_failures'] = 0
+                self.state['total_success'] += 1
+            else:
+                self.state['consecutive_failures'] += 1
+                self.state['total_failures'] += 1
             
-        # Update overall status
-        if self.state['consecutive_failures'] == 0:
-            self.state['status'] = 'healthy'
-        elif self.state['consecutive_failures'] <= 3:
-            self.state['status'] = 'degraded'
-        else:
-            self.state['status'] = 'failing'
+            # Update overall status
+            if self.state['consecutive_failures'] == 0:
+                self.state['status'] = 'healthy'
+            elif self.state['consecutive_failures'] <= 3:
+                self.state['status'] = 'degraded'
+            else:
+                self.state['status'] = 'failing'
             
-        # Store check details
-        if details:
-            self.state['last_check_details'] = details
+            # Store check details
+            if details:
+                self.state['last_check_details'] = details
             
-        self._save_state()
+            self._schedule_save()
         
     def get_health_status(self) -> Dict[str, Any]:
         """Get current health status."""
@@ -121,3 +172,9 @@ class HealthMonitor:
         except Exception as e:
             logger.error(f"Error calculating success rate: {str(e)}")
             return 0.0
+
+@atexit.register
+def _flush_live_monitors():
+    """Write out any state still pending when the interpreter exits"""
+    for monitor in list(_live_monitors):
+        monitor.flush()
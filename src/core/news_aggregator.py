@@ -2,19 +2,61 @@
 News aggregator with failover support.
 """
 import logging
-from typing import List, Dict, Any
+import time
+import threading
+import concurrent.futures
+from collections import deque
+from typing import List, Dict, Any, Optional
 from .gdelt_provider import GdeltNewsProvider
 from .guardian_provider import GuardianNewsProvider
 from .newsapi_provider import NewsAPIProvider
+from .health_monitor import HealthMonitor
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds a provider's articles for a category are reused; matches NewsAPI's own response cache
+_CACHE_TTL = 300
+
+# Supported news categories
+_CATEGORIES = (
+    'technology',
+    'business',
+    'science',
+    'sports',
+    'entertainment',
+    'politics',
+    'markets',
+    'general'
+)
+
+# Seconds the best-ranked provider gets before the next one is also asked; a
+# provider that fails hands over immediately
+_HEDGE_DELAY = 2.0
+
+# Categories fetched at once by fetch_news_bulk, to stay under provider rate limits
+_BULK_WORKERS = 5
+
+# A provider failing more than _BREAKER_THRESHOLD times within _BREAKER_WINDOW
+# seconds is skipped for _BREAKER_COOLDOWN seconds instead of being retried on every call
+_BREAKER_THRESHOLD = 5
+_BREAKER_WINDOW = 60
+_BREAKER_COOLDOWN = 60
+
+# Providers are tried best score first: an EWMA of success (0-1) minus
+# _LATENCY_WEIGHT per second of EWMA latency; ties keep the configured priority
+_SCORE_ALPHA = 0.3
+_LATENCY_WEIGHT = 0.1
+
 class NewsAggregator:
     """Aggregates news from multiple providers with failover support."""
     
-    def __init__(self):
-        """Initialize the news aggregator with all providers."""
+    def __init__(self, cache_ttl: float = _CACHE_TTL, clock=time.monotonic,
+                 health_monitor: Optional[HealthMonitor] = None, hedge_delay: float = _HEDGE_DELAY):
+        """Initialize the news aggregator with all providers.
+        
+        Provider scores are loaded from and saved to health_monitor when given.
+        """
         self.providers = [
            
             GuardianNewsProvider(),   # Primary provider
@@ -26,47 +68,222 @@ class NewsAggregator:
         self.available_providers = [p for p in self.providers if p.is_available]
         if not self.available_providers:
             logger.error("No news providers are available!")
+        
+        # (provider name, category) -> (expiry, articles)
+        self.cache_ttl = cache_ttl
+        self._now = clock
+        self._cache: Dict[tuple, tuple] = {}
+        self.hedge_delay = hedge_delay
+        
+        # Circuit breaker state: provider name -> recent failure times / end of cool-down
+        self._failures: Dict[str, deque] = {}
+        self._cooldown_until: Dict[str, float] = {}
+        
+        # Provider name -> {'success': EWMA, 'latency': EWMA seconds}; updated from worker threads
+        self.health_monitor = health_monitor
+        self._scores: Dict[str, Dict[str, float]] = {}
+        if health_monitor:
+            self._scores = {name: dict(score) for name, score in health_monitor.get_provider_scores().items()}
+        self._lock = threading.Lock()
 
-    def fetch_news(self, category: str = None, max_articles: int = 50) -> List[Dict[str, Any]]:
+    def fetch_news(self, category: str = None, max_articles: int = 50, mode: str = 'first') -> List[Dict[str, Any]]:
         """Fetch news using available providers with failover.
         
+        Providers are asked in score order. The next one is started as soon
+        as the current one fails or returns nothing, or once it has taken
+        hedge_delay seconds, so a slow provider doesn't hold up its fallbacks;
+        the first provider to return articles wins. A request already sent to
+        a fallback can't be cancelled and still counts against that provider's
+        quota, so slow primaries cost extra calls. 'merge' mode asks every
+        provider at once.
+        
         Args:
             category: Optional category to filter by
             max_articles: Maximum number of articles to return
+            mode: 'first' returns the first successful provider's articles;
+                'merge' waits for every provider and combines their articles,
+                dropping duplicates by URL (title when there is no URL)
             
         Returns:
-            List of news articles from the first successful provider
+            List of news articles from the first successful provider, or from
+            all successful providers when merging
             
         Raises:
             Exception: If no providers are available or all providers fail
         """
+        if mode not in ('first', 'merge'):
+            raise ValueError(f"Unknown fetch mode: {mode}")
+        merge = mode == 'merge'
+        
         if not self.available_providers:
             raise Exception("No news providers are available")
             
+        ranked = sorted(self.available_providers, key=lambda p: -self._score(p.name))
+        
+        # A recent result from the best provider avoids any request
+        now = self._now()
+        for provider in ([] if merge else ranked):
+            entry = self._cache.get((provider.name, category))
+            if entry and entry[0] > now:
+                logger.info(f"Using cached articles from {provider.name}")
+                return entry[1][:max_articles]
+            
+        providers = [p for p in ranked
+                     if self._cooldown_until.get(p.name, 0) <= now]
+        if not providers:
+            raise Exception("All news providers are cooling down after repeated failures")
+            
         errors = []
-        for provider in self.available_providers:
-            try:
+        merged = []
+        seen = set()
+        waiting = iter(providers)
+        pending = {}  # future -> provider
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(providers))
+        
+        def start_next():
+            provider = next(waiting, None)
+            if provider:
                 logger.info(f"Attempting to fetch news from {provider.name}")
-                articles = provider.fetch_news(category)
+                future = executor.submit(self._fetch_from, provider, category)
+                pending[future] = provider
+        
+        try:
+            for _ in range(len(providers) if merge else 1):
+                start_next()
+            
+            while pending:
+                done, _ = concurrent.futures.wait(
+                    pending, timeout=None if merge else self.hedge_delay,
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                if not done:
+                    # The current providers are slow; ask the next one as well
+                    start_next()
+                    continue
                 
-                if articles:
-                    logger.info(f"Successfully fetched {len(articles)} articles from {provider.name}")
-                    # Sort by date and limit to max_articles
-                    articles.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
-                    return articles[:max_articles]
-                else:
-                    logger.warning(f"No articles returned from {provider.name}, trying next provider")
+                # Finished together: prefer the better-ranked provider
+                for future in sorted(done, key=lambda f: providers.index(pending[f])):
+                    provider = pending.pop(future)
+                    try:
+                        articles = future.result()
+                        
+                        if articles:
+                            logger.info(f"Successfully fetched {len(articles)} articles from {provider.name}")
+                            # Sort by date and limit to max_articles
+                            articles.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
+                            self._cache[(provider.name, category)] = (self._now() + self.cache_ttl, articles)
+                            if not merge:
+                                return articles[:max_articles]
+                            
+                            for article in articles:
+                                key = article.get('url') or article.get('title')
+                                if key not in seen:
+                                    seen.add(key)
+                                    merged.append(article)
+                        else:
+                            logger.warning(f"No articles returned from {provider.name}, trying next provider")
+                            
+                    except Exception as e:
+                        logger.error(f"Error fetching news from {provider.name}: {e}")
+                        errors.append(f"{provider.name}: {str(e)}")
                     
-            except Exception as e:
-                logger.error(f"Error fetching news from {provider.name}: {e}")
-                errors.append(f"{provider.name}: {str(e)}")
-                continue
+                    start_next()
+        finally:
+            # Don't wait on providers still running once a result has been chosen
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._save_scores()
+            
+        if merged:
+            merged.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
+            return merged[:max_articles]
                 
         # If we get here, all providers failed
         error_msg = "All news providers failed: " + "; ".join(errors)
         logger.error(error_msg)
         raise Exception(error_msg)
 
+    def _fetch_from(self, provider, category: str = None) -> List[Dict[str, Any]]:
+        """Fetch from one provider, recording the outcome before returning
+        
+        Runs on a worker thread, so providers whose results aren't used still
+        update their score and circuit breaker.
+        """
+        start = self._now()
+        try:
+            articles = provider.fetch_news(category)
+        except Exception:
+            self._record_outcome(provider, False, self._now() - start)
+            raise
+        self._record_outcome(provider, True, self._now() - start)
+        return articles
+
+    def _score(self, name: str) -> float:
+        """Ranking score for a provider; unseen providers score as healthy and instant"""
+        score = self._scores.get(name)
+        if not score:
+            return 1.0
+        return score['success'] - _LATENCY_WEIGHT * score['latency']
+
+    def _record_outcome(self, provider, success: bool, latency: float) -> None:
+        """Fold one fetch into the provider's score, and its breaker on failure"""
+        with self._lock:
+            score = self._scores.setdefault(provider.name, {'success': 1.0, 'latency': latency})
+            score['success'] += _SCORE_ALPHA * (float(success) - score['success'])
+            score['latency'] += _SCORE_ALPHA * (latency - score['latency'])
+            if not success:
+                self._record_failure(provider)
+
+    def _save_scores(self) -> None:
+        """Persist provider scores to the health monitor, if there is one"""
+        if not self.health_monitor:
+            return
+        with self._lock:
+            scores = {name: dict(score) for name, score in self._scores.items()}
+        self.health_monitor.update_provider_scores(scores)
+
+    def _record_failure(self, provider) -> None:
+        """Count a failed fetch and start a cool-down if the provider keeps failing"""
+        now = self._now()
+        failures = self._failures.setdefault(provider.name, deque())
+        failures.append(now)
+        while failures[0] <= now - _BREAKER_WINDOW:
+            failures.popleft()
+        if len(failures) > _BREAKER_THRESHOLD:
+            logger.warning(f"{provider.name} failed {len(failures)} times in {_BREAKER_WINDOW}s; "
+                           f"skipping it for {_BREAKER_COOLDOWN}s")
+            self._cooldown_until[provider.name] = now + _BREAKER_COOLDOWN
+            failures.clear()
+
+    def fetch_news_bulk(self, categories: List[str], max_articles: int = 50) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch several categories concurrently.
+        
+        Args:
+            categories: Categories to fetch
+            max_articles: Maximum number of articles per category
+            
+        Returns:
+            Articles keyed by category, in the order given; a category for
+            which every provider failed maps to an empty list
+        """
+        if not categories:
+            return {}
+            
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(_BULK_WORKERS, len(categories))) as executor:
+            future_to_category = {
+                executor.submit(self.fetch_news, category, max_articles): category
+                for category in categories
+            }
+            for future in concurrent.futures.as_completed(future_to_category):
+                category = future_to_category[future]
+                try:
+                    results[category] = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching {category} news: {e}")
+                    results[category] = []
+                    
+        return {category: results[category] for category in categories}
+
     def get_provider_status(self) -> List[Dict[str, Any]]:
         """Get the status of all providers.
         
@@ -83,6 +300,9 @@ class NewsAggregator:
         """Reset all providers to available state."""
         for provider in self.providers:
             provider.mark_available()
+        self._failures.clear()
+        self._cooldown_until.clear()
+        self._scores.clear()
         self.available_providers = [p for p in self.providers if p.is_available]
 
     def get_categories(self) -> List[str]:
@@ -91,13 +311,4 @@ class NewsAggregator:
         Returns:
             List of category strings
         """
-        return [
-            'technology',
-            'business',
-            'science',
-            'sports',
-            'entertainment',
-            'politics',
-            'markets',
-            'general'
-        ]
+        return list(_CATEGORIES)
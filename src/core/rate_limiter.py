@@ -2,25 +2,39 @@
 Rate limiter and cache manager
 """
 import time
-import json
+import orjson
 import os
+import heapq
+import atexit
+import weakref
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List, Tuple
 import logging
-from threading import Lock
+from threading import Lock, Timer
+
+# Caches with unflushed writes, flushed on interpreter exit
+_live_caches = weakref.WeakSet()
 
 class RateLimiter:
-    def __init__(self, calls: int, time_window: int):
+    def __init__(self, calls: int, time_window: int,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
         """
         Initialize rate limiter
         Args:
             calls: Number of calls allowed
             time_window: Time window in seconds
+            clock: Time source in seconds (injectable for tests)
+            sleep: Blocking wait used by wait_if_needed
         """
         self.calls = calls
         self.time_window = time_window
-        self.timestamps = []
+        # Oldest first, so expired calls are dropped from the left
+        self.timestamps = deque()
         self.lock = Lock()
+        self._now = clock
+        self._sleep = sleep
         
     def try_acquire(self) -> bool:
         """
@@ -29,13 +43,16 @@ class RateLimiter:
             bool: True if allowed, False if rate limit exceeded
         """
         with self.lock:
-            now = time.time()
+            now = self._now()
+            cutoff = now - self.time_window
             
             # Remove timestamps outside the window
-            self.timestamps = [ts for ts in self.timestamps if ts > now - self.time_window]
+            timestamps = self.timestamps
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
             
-            if len(self.timestamps) < self.calls:
-                self.timestamps.append(now)
+            if len(timestamps) < self.calls:
+                timestamps.append(now)
                 return True
                 
             return False
@@ -46,18 +63,38 @@ class RateLimiter:
         Returns:
             float: Time waited in seconds
         """
+        waited = 0.0
         while not self.try_acquire():
-            time.sleep(1)
-        return 0.0
+            # Sleep until the oldest call leaves the window rather than polling
+            with self.lock:
+                delay = self.timestamps[0] + self.time_window - self._now() if self.timestamps else 0.0
+            delay = max(delay, 0.001)
+            self._sleep(delay)
+            waited += delay
+        return waited
 
 class EnhancedCache:
-    def __init__(self, cache_dir: str = "cache"):
+    def __init__(self, cache_dir: str = "cache", clock: Callable[[], float] = time.time,
+                 in_memory: bool = False, flush_interval: float = 1.0):
         self.cache_dir = cache_dir
+        # Memory-only mode never touches the filesystem
+        self.in_memory = in_memory
         self.memory_cache: Dict[str, Any] = {}
+        # (expiry, key) min-heap so clear_expired only visits expired entries;
+        # entries made stale by an overwrite are skipped when popped
+        self._ttl_heap: List[Tuple[float, str]] = []
         self.default_expiry = timedelta(hours=1)
         self.lock = Lock()
+        # Wall-clock seconds, since expiry times are persisted across processes
+        self._now = clock
+        
+        # Writes are buffered per key and written out together by flush()
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_lock = Lock()
+        self._flush_timer: Optional[Timer] = None
         
-        if not os.path.exists(cache_dir):
+        if not in_memory and not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
             
     def get(self, key: str) -> Optional[Any]:
@@ -68,23 +105,33 @@ class EnhancedCache:
         with self.lock:
             if key in self.memory_cache:
                 data = self.memory_cache[key]
-                if datetime.now() < data['expiry']:
+                if self._now() < data['expiry']:
                     return data['value']
                 else:
                     del self.memory_cache[key]
+            
+            # An unflushed write is newer than whatever is on disk
+            if key in self._pending:
+                return None
+        
+        if self.in_memory:
+            return None
         
         # Try file cache
         cache_file = os.path.join(self.cache_dir, f"{key}.json")
         try:
             if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    if datetime.fromisoformat(data['expiry']) > datetime.now():
+                with open(cache_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+                    expiry = datetime.fromisoformat(data['expiry']).timestamp()
+                    if expiry > self._now():
                         # Update memory cache
-                        self.memory_cache[key] = {
-                            'value': data['value'],
-                            'expiry': datetime.fromisoformat(data['expiry'])
-                        }
+                        with self.lock:
+                            self.memory_cache[key] = {
+                                'value': data['value'],
+                                'expiry': expiry
+                            }
+                            heapq.heappush(self._ttl_heap, (expiry, key))
                         return data['value']
                     else:
                         os.remove(cache_file)
@@ -97,25 +144,56 @@ class EnhancedCache:
         """
         Set item in cache
         """
-        expiry_time = datetime.now() + (expiry or self.default_expiry)
+        self.set_many({key: value}, expiry)
+    
+    def set_many(self, items: Dict[str, Any], expiry: Optional[timedelta] = None):
+        """
+        Set several items under one lock acquisition, sharing one expiry
+        """
+        expiry_time = self._now() + (expiry or self.default_expiry).total_seconds()
         
-        # Update memory cache
+        # Update memory cache and queue the file writes
         with self.lock:
-            self.memory_cache[key] = {
-                'value': value,
-                'expiry': expiry_time
-            }
-        
-        # Update file cache
-        cache_file = os.path.join(self.cache_dir, f"{key}.json")
-        try:
-            with open(cache_file, 'w') as f:
-                json.dump({
+            for key, value in items.items():
+                entry = {
                     'value': value,
-                    'expiry': expiry_time.isoformat()
-                }, f)
-        except Exception as e:
-            logging.error(f"Cache write error for {key}: {str(e)}")
+                    'expiry': expiry_time
+                }
+                self.memory_cache[key] = entry
+                heapq.heappush(self._ttl_heap, (expiry_time, key))
+                if not self.in_memory:
+                    self._pending[key] = entry
+            
+            if self._pending and self._flush_timer is None:
+                self._flush_timer = Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+                _live_caches.add(self)
+    
+    def flush(self):
+        """
+        Write buffered entries to the file cache, once per key
+        """
+        # Serialised so an older batch can't land after a newer one
+        with self._flush_lock:
+            with self.lock:
+                pending, self._pending = self._pending, {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            
+            for key, entry in pending.items():
+                cache_file = os.path.join(self.cache_dir, f"{key}.json")
+                try:
+                    # Serialise before opening so a failure can't leave a truncated file
+                    data = orjson.dumps({
+                        'value': entry['value'],
+                        'expiry': datetime.fromtimestamp(entry['expiry']).isoformat()
+                    }, option=orjson.OPT_NON_STR_KEYS)
+                    with open(cache_file, 'wb') as f:
+                        f.write(data)
+                except Exception as e:
+                    logging.error(f"Cache write error for {key}: {str(e)}")
             
     def clear_expired(self):
         """
@@ -123,22 +201,27 @@ class EnhancedCache:
         """
         # Clear memory cache
         with self.lock:
-            now = datetime.now()
-            expired_keys = [
-                key for key, data in self.memory_cache.items()
-                if data['expiry'] < now
-            ]
-            for key in expired_keys:
-                del self.memory_cache[key]
+            now = self._now()
+            heap = self._ttl_heap
+            while heap and heap[0][0] < now:
+                expiry, key = heapq.heappop(heap)
+                entry = self.memory_cache.get(key)
+                if entry is not None and entry['expiry'] == expiry:
+                    del self.memory_cache[key]
+        
+        if self.in_memory:
+            return
+        
+        self.flush()
         
         # Clear file cache
         for filename in os.listdir(self.cache_dir):
             if filename.endswith('.json'):
                 filepath = os.path.join(self.cache_dir, filename)
                 try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        if datetime.fromisoformat(data['expiry']) < now:
+                    with open(filepath, 'rb') as f:
+                        data = orjson.loads(f.read())
+                        if datetime.fromisoformat(data['expiry']).timestamp() < now:
                             os.remove(filepath)
                 except Exception as e:
                     logging.error(f"Error clearing cache file {filename}: {str(e)}")
@@ -147,10 +230,19 @@ class EnhancedCache:
         """
         Get cache size information
         """
+        if not self.in_memory:
+            self.flush()
+        
         memory_size = len(self.memory_cache)
-        file_size = len([f for f in os.listdir(self.cache_dir) if f.endswith('.json')])
+        file_size = 0 if self.in_memory else len([f for f in os.listdir(self.cache_dir) if f.endswith('.json')])
         
         return {
             'memory_items': memory_size,
             'file_items': file_size
         }
+
+@atexit.register
+def _flush_live_caches():
+    """Write out anything still buffered when the interpreter exits"""
+    for cache in list(_live_caches):
+        cache.flush()
@@ -3,7 +3,11 @@ Validation utilities for news data
 """
 from typing import List, Dict, Any
 from datetime import datetime
-import json
+import os
+import orjson
+
+# Fields every article must have
+_REQUIRED_FIELDS = frozenset(('title', 'url', 'publishedAt', 'source'))
 
 def validate_article(article: Dict[str, Any]) -> bool:
     """
@@ -15,10 +19,8 @@ def validate_article(article: Dict[str, Any]) -> bool:
     Returns:
         True if article is valid, False otherwise
     """
-    required_fields = ['title', 'url', 'publishedAt', 'source']
-    
-    # Check required fields
-    if not all(field in article for field in required_fields):
+    # Check required fields with a single set comparison
+    if not isinstance(article, dict) or not article.keys() >= _REQUIRED_FIELDS:
         return False
         
     # Validate source structure
@@ -67,26 +69,24 @@ def save_news_data(articles: List[Dict[str, Any]], filepath: str) -> bool:
     try:
         # Write to temporary file first
         temp_path = filepath + '.tmp'
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, ensure_ascii=False, indent=2)
+        with open(temp_path, 'wb') as f:
+            f.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
             
         # Validate the written data
-        with open(temp_path, 'r', encoding='utf-8') as f:
-            test_load = json.load(f)
+        with open(temp_path, 'rb') as f:
+            test_load = orjson.loads(f.read())
             
         if not validate_news_data(test_load):
             return False
             
-        # If validation passes, rename temp file to actual file
-        import os
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        os.rename(temp_path, filepath)
+        # If validation passes, atomically swap the temp file into place
+        os.replace(temp_path, filepath)
         return True
         
     except Exception:
         # Clean up temp file if it exists
-        import os
         if os.path.exists(temp_path):
             try:
                 os.remove(temp_path)
@@ -2,18 +2,19 @@
 Enhanced News Service with web scraping and AI summarization
 """
 import yaml
+import orjson
 import logging
 import asyncio
 import concurrent.futures
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 # Import our modules
 from sources import RSSAdapter
 from scraper import HTTPClient
 from summarizer import OllamaSummarizer
-from publisher import JSONPublisher, GitPublisher
+from publisher import JSONPublisher, GitPublisher, write_json_atomic
 
 class EnhancedNewsService:
     """Enhanced news service with AI summarization"""
@@ -41,6 +42,11 @@ class EnhancedNewsService:
             self.git_publisher = None
         
         self.logger = logging.getLogger(__name__)
+        
+        # RSS validators from the previous run, for conditional feed requests
+        self.feed_state_path = Path(self.config.get('feed_state_file', 'cache/feed_state.json'))
+        self.feed_state = self.load_feed_state()
+        self.pending_feed_state = {}
     
     def load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file"""
@@ -68,10 +74,35 @@ class EnhancedNewsService:
             ]
         )
     
+    def load_feed_state(self) -> Dict[str, Dict[str, str]]:
+        """Load per-feed ETag / Last-Modified values"""
+        try:
+            if self.feed_state_path.exists():
+                return orjson.loads(self.feed_state_path.read_bytes())
+        except Exception as e:
+            self.logger.error(f"Error loading feed state: {str(e)}")
+        return {}
+    
+    def save_feed_state(self):
+        """Persist per-feed ETag / Last-Modified values"""
+        try:
+            self.feed_state_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.feed_state_path, self.feed_state)
+        except Exception as e:
+            self.logger.error(f"Error saving feed state: {str(e)}")
+    
+    def commit_feed_state(self):
+        """Adopt this run's validators and persist them"""
+        self.feed_state.update(self.pending_feed_state)
+        self.pending_feed_state = {}
+        self.save_feed_state()
+    
     async def run(self):
         """Main execution method"""
         self.logger.info("Starting Enhanced News Service")
         
+        self.pending_feed_state = {}
+        
         try:
             # Fetch articles from all sources
             all_articles = await self.fetch_all_articles()
@@ -102,6 +133,7 @@ class EnhancedNewsService:
             
             if not new_articles:
                 self.logger.info("No new articles to process")
+                self.commit_feed_state()
                 return
             
             # Summarize only NEW articles with AI
@@ -120,6 +152,10 @@ class EnhancedNewsService:
                 self.create_legacy_json(merged_articles)
                 self.logger.info(f"Published {len(merged_articles)} articles to both formats")
                 
+                # Only remember validators once this run's articles are safely published,
+                # otherwise a 304 next time would skip articles that never made it out
+                self.commit_feed_state()
+                
                 # Commit to git if configured
                 if self.git_publisher:
                     commit_msg = f"Update news: {len(summarized_articles)} new articles - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
@@ -129,7 +165,7 @@ class EnhancedNewsService:
                     )
                 
                 # Print stats
-                stats = self.json_publisher.get_stats()
+                stats = self.json_publisher.get_stats(merged_articles)
                 self.logger.info(f"Total articles: {stats['total']}")
                 self.logger.info(f"Categories: {stats['categories']}")
                 
@@ -172,7 +208,7 @@ class EnhancedNewsService:
         try:
             # Create adapter based on discovery method
             if source_config['discovery'] == 'rss':
-                adapter = RSSAdapter(source_config, self.config['user_agent'])
+                adapter = RSSAdapter(source_config, self.config['user_agent'], self.feed_state)
             else:
                 self.logger.warning(f"Unsupported discovery method: {source_config['discovery']}")
                 return articles
@@ -181,32 +217,53 @@ class EnhancedNewsService:
             urls = list(adapter.discover())
             self.logger.info(f"Discovered {len(urls)} URLs from {source_config['id']}")
             
-            # Fetch and parse articles
-            for url in urls:
-                try:
-                    # Fetch HTML
-                    html = adapter.fetch(url)
-                    if not html:
-                        continue
-                    
-                    # Parse article
-                    parsed_data = adapter.parse(html, url)
-                    if not parsed_data or not parsed_data.get('title'):
-                        continue
-                    
-                    # Normalize article
-                    article = adapter.normalize_article(parsed_data, url)
-                    articles.append(article)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing {url}: {str(e)}")
-                    continue
+            # Fetch and parse articles; fetches are network-bound, so a few run at once per source
+            article_workers = self.config.get('article_concurrency', 1)
+            complete = True
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, article_workers)) as executor:
+                for fetched, article in executor.map(lambda url: self.fetch_article(adapter, url), urls):
+                    if article:
+                        articles.append(article)
+                    if not fetched:
+                        complete = False
+            
+            # Keep the old validators for a feed with failed downloads so they are retried;
+            # pages that were fetched but rejected would only be rejected again
+            if complete:
+                self.pending_feed_state.update(adapter.pending_state)
             
         except Exception as e:
             self.logger.error(f"Error fetching from source {source_config['id']}: {str(e)}")
         
         return articles
     
+    def fetch_article(self, adapter: RSSAdapter, url: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Fetch, parse and normalize a single article
+        
+        Returns:
+            Tuple of (fetched, article): fetched is False only when the page couldn't be
+            downloaded, article is None when it failed or was rejected (e.g. no title)
+        """
+        html = ''
+        try:
+            # Fetch HTML
+            html = adapter.fetch(url)
+            if not html:
+                return False, None
+            
+            # Parse article
+            parsed_data = adapter.parse(html, url)
+            if not parsed_data or not parsed_data.get('title'):
+                return True, None
+            
+            # Normalize article
+            return True, adapter.normalize_article(parsed_data, url)
+            
+        except Exception as e:
+            self.logger.error(f"Error processing {url}: {str(e)}")
+            return bool(html), None
+    
     async def summarize_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Summarize articles using AI or fallback"""
         summarized = []
@@ -220,20 +277,7 @@ class EnhancedNewsService:
             # Process articles with fallback summaries
             for article in articles:
                 ai_result = self.summarizer.summarize_article(article)
-                article.update({
-                    'summary': ai_result.get('summary', ''),
-                    'editorial_analysis': ai_result.get('editorial_analysis', ''),
-                    'expert_perspective': ai_result.get('expert_perspective', ''),
-                    'key_insights': ai_result.get('key_insights', []),
-                    'trend_analysis': ai_result.get('trend_analysis', ''),
-                    'future_implications': ai_result.get('future_implications', ''),
-                    'related_topics': ai_result.get('related_topics', []),
-                    'keywords': ai_result.get('keywords', []),
-                    'ai_insights': ai_result.get('insights', ''),  # Keep for backward compatibility
-                    'ai_enhanced': ai_result.get('ai_enhanced', False),
-                    'original_content_ratio': ai_result.get('original_content_ratio', 0.6)
-                })
-                summarized.append(article)
+                summarized.append(self._apply_summary(article, ai_result))
         else:
             # Limit AI processing to most recent articles only
             articles_for_ai = articles[:max_ai_articles] if len(articles) > max_ai_articles else articles
@@ -243,130 +287,68 @@ class EnhancedNewsService:
             if articles_for_fallback:
                 self.logger.info(f"Using fallback for remaining {len(articles_for_fallback)} articles")
             
-            # Process AI articles with timeout protection
-            ai_processed = 0
-            for article in articles_for_ai:
-                try:
-                    self.logger.info(f"AI processing {ai_processed + 1}/{len(articles_for_ai)}: {article.get('title', 'Unknown')[:30]}...")
-                    
-                    # Use timeout for individual article processing
-                    import signal
-                    
-                    def timeout_handler(signum, frame):
-                        raise TimeoutError("AI processing timeout")
-                    
-                    # Set timeout for this article (Windows doesn't support signal, so use try/except)
-                    try:
-                        ai_result = self.summarizer.summarize_article(article)
-                        article.update({
-                            'summary': ai_result.get('summary', ''),
-                            'editorial_analysis': ai_result.get('editorial_analysis', ''),
-                            'expert_perspective': ai_result.get('expert_perspective', ''),
-                            'key_insights': ai_result.get('key_insights', []),
-                            'trend_analysis': ai_result.get('trend_analysis', ''),
-                            'future_implications': ai_result.get('future_implications', ''),
-                            'related_topics': ai_result.get('related_topics', []),
-                            'keywords': ai_result.get('keywords', []),
-                            'ai_insights': ai_result.get('insights', ''),  # Keep for backward compatibility
-                            'ai_enhanced': ai_result.get('ai_enhanced', False),
-                            'original_content_ratio': ai_result.get('original_content_ratio', 0.6)
-                        })
-                        summarized.append(article)
-                        ai_processed += 1
-                        
-                        # Shorter delay for faster processing
-                        import time
-                        time.sleep(0.5)
-                        
-                    except Exception as ai_error:
-                        self.logger.warning(f"AI failed for article, using fallback: {str(ai_error)}")
-                        # Use fallback immediately
-                        fallback_result = self.summarizer.fallback_summary(article)
-                        article.update({
-                            'summary': fallback_result.get('summary', ''),
-                            'editorial_analysis': fallback_result.get('editorial_analysis', ''),
-                            'expert_perspective': fallback_result.get('expert_perspective', ''),
-                            'key_insights': fallback_result.get('key_insights', []),
-                            'trend_analysis': fallback_result.get('trend_analysis', ''),
-                            'future_implications': fallback_result.get('future_implications', ''),
-                            'related_topics': fallback_result.get('related_topics', []),
-                            'keywords': fallback_result.get('keywords', []),
-                            'ai_insights': fallback_result.get('insights', ''),
-                            'ai_enhanced': False,
-                            'original_content_ratio': fallback_result.get('original_content_ratio', 0.6)
-                        })
-                        summarized.append(article)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing article: {str(e)}")
-                    # Use fallback for this article
-                    fallback_result = self.summarizer.fallback_summary(article)
-                    article.update({
-                        'summary': fallback_result.get('summary', ''),
-                        'editorial_analysis': fallback_result.get('editorial_analysis', ''),
-                        'expert_perspective': fallback_result.get('expert_perspective', ''),
-                        'key_insights': fallback_result.get('key_insights', []),
-                        'trend_analysis': fallback_result.get('trend_analysis', ''),
-                        'future_implications': fallback_result.get('future_implications', ''),
-                        'related_topics': fallback_result.get('related_topics', []),
-                        'keywords': fallback_result.get('keywords', []),
-                        'ai_insights': fallback_result.get('insights', ''),
-                        'ai_enhanced': False,
-                        'original_content_ratio': fallback_result.get('original_content_ratio', 0.6)
-                    })
-                    summarized.append(article)
+            # Process AI articles concurrently; the summarizer falls back per article on failure
+            ai_results = self.summarizer.summarize_batch(articles_for_ai)
+            for article, ai_result in zip(articles_for_ai, ai_results):
+                summarized.append(self._apply_summary(article, ai_result))
             
             # Process remaining articles with fallback
             for article in articles_for_fallback:
                 fallback_result = self.summarizer.fallback_summary(article)
-                article.update({
-                    'summary': fallback_result.get('summary', ''),
-                    'editorial_analysis': fallback_result.get('editorial_analysis', ''),
-                    'expert_perspective': fallback_result.get('expert_perspective', ''),
-                    'key_insights': fallback_result.get('key_insights', []),
-                    'trend_analysis': fallback_result.get('trend_analysis', ''),
-                    'future_implications': fallback_result.get('future_implications', ''),
-                    'related_topics': fallback_result.get('related_topics', []),
-                    'keywords': fallback_result.get('keywords', []),
-                    'ai_insights': fallback_result.get('insights', ''),
-                    'ai_enhanced': False,
-                    'original_content_ratio': fallback_result.get('original_content_ratio', 0.6)
-                })
-                summarized.append(article)
+                summarized.append(self._apply_summary(article, fallback_result))
         
         ai_enhanced_count = sum(1 for article in summarized if article.get('ai_enhanced', False))
         self.logger.info(f"Completed processing {len(summarized)} articles ({ai_enhanced_count} AI-enhanced, {len(summarized) - ai_enhanced_count} fallback)")
         return summarized
     
+    def _apply_summary(self, article: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy summarizer output onto an article"""
+        get = result.get
+        article.update({
+            'summary': get('summary', ''),
+            'editorial_analysis': get('editorial_analysis', ''),
+            'expert_perspective': get('expert_perspective', ''),
+            'key_insights': get('key_insights', []),
+            'trend_analysis': get('trend_analysis', ''),
+            'future_implications': get('future_implications', ''),
+            'related_topics': get('related_topics', []),
+            'keywords': get('keywords', []),
+            'ai_insights': get('insights', ''),  # Keep for backward compatibility
+            'ai_enhanced': get('ai_enhanced', False),
+            'original_content_ratio': get('original_content_ratio', 0.6)
+        })
+        return article
+    
     def create_legacy_json(self, articles: List[Dict[str, Any]]):
         """Create backward-compatible news.json file"""
         try:
-            import json
             legacy_articles = []
             
             for article in articles:
+                get = article.get
+                media = get('media')
+                
                 # Convert enhanced format to legacy format
                 legacy_article = {
-                    'id': article.get('id', ''),
-                    'title': article.get('title', ''),
-                    'description': article.get('summary', article.get('excerpt', '')),
-                    'content': article.get('content_snippet', ''),
-                    'publishedAt': article.get('published_at', ''),
+                    'id': get('id', ''),
+                    'title': get('title', ''),
+                    'description': get('summary', get('excerpt', '')),
+                    'content': get('content_snippet', ''),
+                    'publishedAt': get('published_at', ''),
                     'source': {
-                        'name': article.get('source', 'Unknown Source')
+                        'name': get('source', 'Unknown Source')
                     },
-                    'author': article.get('author'),
-                    'url': article.get('source_url', ''),
-                    'urlToImage': article.get('media', [{}])[0].get('url') if article.get('media') else None,
-                    'category': article.get('category', 'general'),
-                    'aiEnhanced': article.get('ai_enhanced', False)
+                    'author': get('author'),
+                    'url': get('source_url', ''),
+                    'urlToImage': media[0].get('url') if media else None,
+                    'category': get('category', 'general'),
+                    'aiEnhanced': get('ai_enhanced', False)
                 }
                 legacy_articles.append(legacy_article)
             
             # Write legacy format
             legacy_path = Path(self.config['output_dir']) / 'news.json'
-            with open(legacy_path, 'w', encoding='utf-8') as f:
-                json.dump(legacy_articles, f, indent=2, ensure_ascii=False)
+            write_json_atomic(legacy_path, legacy_articles)
             
             self.logger.info(f"Created legacy news.json with {len(legacy_articles)} articles")
             
@@ -8,7 +8,6 @@ import servicemanager
 import socket
 import sys
 import os
-import time
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
@@ -68,24 +67,25 @@ class NewsUpdaterService(win32serviceutil.ServiceFramework):
             # Update interval in minutes
             update_interval = int(os.getenv('NEWS_UPDATE_INTERVAL', 30))
             logger.info(f"Update interval set to {update_interval} minutes")
-            last_update = time.time()
+            
+            interval_ms = update_interval * 60 * 1000
+            wait_ms = interval_ms
             
             while self.running:
+                # Sleep until the next update is due; SvcStop signals the event to wake us early
+                if win32event.WaitForSingleObject(self.stop_event, wait_ms) == win32event.WAIT_OBJECT_0:
+                    break
+                
                 try:
-                    # Check if it's time for an update
-                    if time.time() - last_update >= update_interval * 60:
-                        logger.info("Starting scheduled news update")
-                        update_all_news()
-                        last_update = time.time()
-                        logger.info("Scheduled news update completed")
-                    
-                    # Sleep for a minute
-                    time.sleep(60)
+                    logger.info("Starting scheduled news update")
+                    update_all_news()
+                    logger.info("Scheduled news update completed")
+                    wait_ms = interval_ms
                     
                 except Exception as e:
                     logger.error(f"Error during news update: {str(e)}")
                     # Wait for 5 minutes before retrying after an error
-                    time.sleep(300)
+                    wait_ms = 300 * 1000
                 
         except Exception as e:
             error_msg = f"Critical service error: {str(e)}"
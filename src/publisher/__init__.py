@@ -1,7 +1,7 @@
 """
 Publishing utilities for news data
 """
-from .json_publisher import JSONPublisher
+from .json_publisher import JSONPublisher, write_json_atomic
 from .git_publisher import GitPublisher
 
-__all__ = ['JSONPublisher', 'GitPublisher']
\ No newline at end of file
+__all__ = ['JSONPublisher', 'GitPublisher', 'write_json_atomic']
\ No newline at end of file
@@ -1,15 +1,39 @@
 """
 JSON file publisher for news data
 """
-import json
+import heapq
+import orjson
 import os
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+def write_json_atomic(path: Path, data: Any) -> None:
+    """
+    Write data as indented JSON via a temp file and os.replace
+    
+    Readers see either the old file or the complete new one, never a
+    partially written file.
+    
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+    """
+    temp_path = Path(f"{path}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+
 class JSONPublisher:
     """Publisher for JSON news data"""
     
@@ -49,8 +73,7 @@ class JSONPublisher:
             }
             
             # Write to file
-            with open(self.output_path, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            write_json_atomic(self.output_path, output_data)
             
             logger.info(f"Published {len(sorted_articles)} articles to {self.output_path}")
             return True
@@ -68,8 +91,8 @@ class JSONPublisher:
         """
         try:
             if self.output_path.exists():
-                with open(self.output_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.output_path, 'rb') as f:
+                    data = orjson.loads(f.read())
                     return data.get('articles', [])
             return []
             
@@ -111,26 +134,26 @@ class JSONPublisher:
             if article_url:
                 existing_urls.add(article_url)
         
-        # Combine and sort
-        all_articles = unique_new + existing_articles
-        sorted_articles = sorted(
-            all_articles,
-            key=lambda x: x.get('published_at', ''),
-            reverse=True
+        # Keep the newest max_articles without concatenating and sorting everything
+        return heapq.nlargest(
+            max_articles,
+            chain(unique_new, existing_articles),
+            key=lambda x: x.get('published_at', '')
         )
-        
-        # Limit to max articles
-        return sorted_articles[:max_articles]
     
-    def get_stats(self) -> Dict[str, Any]:
+    def get_stats(self, articles: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Get statistics about published articles
         
+        Args:
+            articles: Articles just published; loaded from disk if omitted
+            
         Returns:
             Dict with statistics
         """
         try:
-            articles = self.load_existing()
+            if articles is None:
+                articles = self.load_existing()
             if not articles:
                 return {'total': 0, 'categories': {}, 'sources': {}}
             
@@ -4,11 +4,15 @@ Base source adapter class for news fetching
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Iterator
 import hashlib
+import re
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Whitespace-separated tokens, counted without building a word list
+_WORD_RE = re.compile(r'\S+')
+
 class SourceAdapter(ABC):
     """Base class for all source adapters"""
     
@@ -115,7 +119,7 @@ class SourceAdapter(ABC):
         if not text:
             return 1
         
-        words = len(text.split())
+        words = sum(1 for _ in _WORD_RE.finditer(text))
         # Average reading speed: 200 words per minute
         minutes = max(1, round(words / 200))
         return minutes
@@ -3,21 +3,35 @@ RSS-based source adapter
 """
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from typing import Iterator, Dict, Any
+from typing import Iterator, Dict, Any, Optional
 from datetime import datetime
+from dateutil import parser as date_parser
 import logging
 from .base_adapter import SourceAdapter
 
 logger = logging.getLogger(__name__)
 
+# Shared across adapters so article fetches reuse keep-alive connections and
+# TLS sessions; sized for the service's per-source worker pool
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
 class RSSAdapter(SourceAdapter):
     """Adapter for RSS-based news sources"""
     
-    def __init__(self, config: Dict[str, Any], user_agent: str = None):
+    def __init__(self, config: Dict[str, Any], user_agent: str = None,
+                 feed_state: Optional[Dict[str, Dict[str, str]]] = None):
         super().__init__(config)
         self.rss_url = config.get('rss')
         self.user_agent = user_agent or 'NewsSurgeAI/1.0'
+        # ETag / Last-Modified per feed URL, shared across runs by the caller
+        self.feed_state = feed_state if feed_state is not None else {}
+        # Validators seen this run; the caller merges them into feed_state once
+        # the feed's articles are published
+        self.pending_state = {}
         
         if not self.rss_url:
             raise ValueError(f"RSS URL required for source {self.source_id}")
@@ -35,7 +49,23 @@ class RSSAdapter(SourceAdapter):
             # Set user agent for feedparser
             feedparser.USER_AGENT = self.user_agent
             
-            feed = feedparser.parse(self.rss_url)
+            # Conditional GET: an unchanged feed answers 304 with no body
+            state = self.feed_state.get(self.rss_url, {})
+            feed = feedparser.parse(
+                self.rss_url,
+                etag=state.get('etag'),
+                modified=state.get('modified')
+            )
+            
+            if feed.get('status') == 304:
+                logger.info(f"RSS feed unchanged since last run: {self.source_name}")
+                return
+            
+            if feed.get('etag') or feed.get('modified'):
+                self.pending_state[self.rss_url] = {
+                    'etag': feed.get('etag'),
+                    'modified': feed.get('modified')
+                }
             
             if feed.bozo:
                 logger.warning(f"RSS feed has issues: {feed.bozo_exception}")
@@ -74,7 +104,7 @@ class RSSAdapter(SourceAdapter):
                 'Connection': 'keep-alive',
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = _session.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             
             return response.text
@@ -162,9 +192,12 @@ class RSSAdapter(SourceAdapter):
                 date_str = element.get('content') or element.get('datetime')
                 if date_str:
                     try:
-                        # Try to parse and format the date
-                        from dateutil import parser
-                        parsed_date = parser.parse(date_str)
+                        # Try to parse and format the date; most sites publish ISO 8601,
+                        # which the C parser handles without dateutil's fuzzy matching
+                        try:
+                            parsed_date = datetime.fromisoformat(date_str)
+                        except ValueError:
+                            parsed_date = date_parser.parse(date_str)
                         return parsed_date.isoformat() + 'Z'
                     except:
                         pass
@@ -3,22 +3,174 @@ Ollama-based AI summarization service
 """
 import subprocess
 import json
+import concurrent.futures
 import logging
+import re
 import requests
 from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Lowercase alphabetic words of five or more letters, used for keyword extraction
+_WORD_RE = re.compile(r'[a-z]{5,}')
+
+# Sentence pieces between '. ' separators, scanned lazily for summary extraction
+_SENT_RE = re.compile(r'(?:[^.]|\.(?! ))+')
+
+# Title terms that add extra context to the fallback analysis
+_AI_TERMS = ('ai', 'artificial intelligence', 'machine learning')
+_CLIMATE_TERMS = ('climate', 'environment', 'sustainability')
+_ECONOMIC_TERMS = ('economic', 'financial', 'investment')
+
+# Per-category analysis focus injected into the prompt
+_CATEGORY_CONTEXT = {
+    'technology': 'Analyze technological innovations, industry disruption potential, competitive landscape, and future implications.',
+    'business': 'Examine business strategy, market dynamics, competitive positioning, financial impact, and industry trends.',
+    'science': 'Explore scientific significance, research methodology, real-world applications, and broader implications.',
+    'markets': 'Analyze market forces, economic indicators, investment implications, and financial trends.',
+    'politics': 'Examine policy implications, political strategy, governance impact, and societal effects.',
+    'health': 'Assess medical significance, public health impact, treatment implications, and healthcare trends.',
+    'sports': 'Analyze performance factors, competitive dynamics, industry trends, and cultural impact.',
+    'entertainment': 'Examine cultural significance, industry trends, audience impact, and creative innovation.',
+    'general': 'Provide comprehensive analysis of key developments, implications, and broader context.'
+}
+
+# JSON schema passed to Ollama's structured output mode so HTTP responses
+# always parse with a single json.loads
+_RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'original_summary': {'type': 'string'},
+        'editorial_analysis': {'type': 'string'},
+        'expert_perspective': {'type': 'string'},
+        'key_insights': {'type': 'array', 'items': {'type': 'string'}},
+        'trend_analysis': {'type': 'string'},
+        'future_implications': {'type': 'string'},
+        'related_topics': {'type': 'array', 'items': {'type': 'string'}},
+        'keywords': {'type': 'array', 'items': {'type': 'string'}}
+    },
+    'required': ['original_summary', 'key_insights', 'keywords']
+}
+
+# Fallback content templates, keyed by category
+_ANALYSIS_TEMPLATES = {
+    'technology': "This technological development represents a significant advancement in the industry. {title} highlights emerging trends that could reshape how businesses and consumers interact with technology. The implications extend beyond immediate applications to influence broader digital transformation strategies.",
+    'business': "This business development signals important shifts in market dynamics. {title} reflects strategic decisions that could influence competitive positioning and industry standards. The economic implications suggest potential ripple effects across related sectors.",
+    'science': "This scientific advancement contributes valuable insights to our understanding of the field. {title} represents research that could lead to practical applications and influence future studies. The methodology and findings have broader implications for scientific progress.",
+    'markets': "This market development indicates significant shifts in financial sentiment and trading patterns. {title} reflects economic forces that could influence investor behavior and market stability. The implications extend to both domestic and international financial markets.",
+    'sports': "This sports development showcases the evolving landscape of athletic competition and performance. {title} highlights trends that influence both individual athletes and the broader sports industry. The implications extend to fan engagement and commercial opportunities.",
+    'general': "This development represents an important shift in current affairs and public discourse. {title} reflects broader societal trends and policy implications that could influence future decisions and public opinion."
+}
+
+_EDITORIAL_TEMPLATES = {
+    'technology': "From an editorial perspective, this technological advancement represents more than just innovation—it signals a fundamental shift in how we approach digital solutions. The broader implications suggest that organizations must adapt their strategies to remain competitive in an increasingly technology-driven marketplace. This development also raises important questions about digital equity and access to emerging technologies.\n\nThe timing of this announcement is particularly significant, as it comes during a period of rapid technological evolution. Industry experts suggest that such developments could accelerate the adoption of similar technologies across various sectors, potentially creating new opportunities for collaboration and growth.",
+    'business': "This business development reflects broader economic trends that extend far beyond the immediate industry impact. Our analysis suggests that this move could influence competitive dynamics and market positioning across related sectors. The strategic implications are particularly noteworthy for companies operating in similar markets.\n\nFrom a market perspective, this development comes at a crucial time when businesses are reassessing their operational strategies and growth trajectories. The ripple effects could influence supply chain decisions, partnership strategies, and investment priorities across the industry landscape.",
+    'markets': "This market development occurs within a complex economic environment that demands careful analysis of both immediate and long-term implications. Our editorial assessment suggests that this could influence trading patterns and investor sentiment across multiple asset classes. The timing is particularly significant given current economic uncertainties.\n\nThe broader financial implications extend beyond immediate market reactions to influence policy discussions and regulatory considerations. This development could serve as a catalyst for broader conversations about market stability and economic growth strategies.",
+    'science': "This scientific advancement represents a significant contribution to our understanding of the field, with implications that extend far beyond the immediate research findings. Our editorial analysis suggests that this work could influence future research directions and practical applications across multiple disciplines.\n\nThe methodology and approach demonstrated in this research could serve as a model for similar studies, potentially accelerating progress in related areas. The broader implications for scientific collaboration and knowledge sharing are particularly noteworthy.",
+    'general': "This development reflects broader societal trends that deserve careful consideration and analysis. Our editorial perspective suggests that the implications extend beyond immediate impacts to influence policy discussions and public discourse. The timing is particularly significant given current social and political dynamics.\n\nThe broader context of this development highlights important questions about governance, public policy, and social responsibility. These considerations could influence future decision-making processes and public engagement strategies."
+}
+
+_EXPERT_TEMPLATES = {
+    'technology': "Industry experts emphasize that this technological development represents a paradigm shift with far-reaching implications. The technical architecture and implementation strategy suggest a sophisticated approach to addressing current market challenges. Professional analysis indicates that this could establish new industry standards and influence competitive positioning.",
+    'business': "Business analysts highlight the strategic significance of this development, noting its potential to reshape competitive dynamics and market positioning. The operational implications suggest a well-considered approach to addressing current business challenges. Expert assessment indicates strong potential for industry-wide influence.",
+    'markets': "Financial experts note that this market development reflects sophisticated understanding of current economic dynamics and investor sentiment. The strategic timing and approach suggest careful consideration of market conditions and regulatory environment. Professional analysis indicates potential for significant market influence.",
+    'science': "Research experts emphasize the methodological rigor and innovative approach demonstrated in this scientific advancement. The findings contribute valuable insights to the existing body of knowledge and suggest promising directions for future research. Expert assessment indicates strong potential for practical applications.",
+    'general': "Policy experts highlight the broader implications of this development for governance and public administration. The strategic approach and timing suggest careful consideration of current political and social dynamics. Professional analysis indicates potential for significant influence on public discourse and policy development."
+}
+
+_CATEGORY_INSIGHTS = {
+    'technology': [
+        "Technological innovation continues to accelerate across multiple sectors",
+        "Digital transformation strategies require adaptive approaches",
+        "Emerging technologies create new opportunities for competitive advantage",
+        "Industry collaboration becomes increasingly important for innovation",
+        "Consumer adoption patterns influence technology development cycles"
+    ],
+    'business': [
+        "Strategic positioning becomes crucial in competitive markets",
+        "Operational efficiency drives sustainable business growth",
+        "Market dynamics require adaptive business strategies",
+        "Industry partnerships create value through collaboration",
+        "Economic conditions influence business decision-making processes"
+    ],
+    'markets': [
+        "Market volatility reflects broader economic uncertainties",
+        "Investment strategies must adapt to changing conditions",
+        "Financial innovation creates new opportunities and risks",
+        "Regulatory developments influence market dynamics",
+        "Global economic trends impact local market conditions"
+    ],
+    'science': [
+        "Scientific research drives innovation across multiple disciplines",
+        "Collaborative research approaches accelerate discovery",
+        "Practical applications emerge from theoretical advances",
+        "Research methodology influences outcome reliability",
+        "Scientific findings inform policy and practice decisions"
+    ],
+    'general': [
+        "Current developments reflect broader societal trends",
+        "Policy implications extend beyond immediate impacts",
+        "Public engagement influences decision-making processes",
+        "Social dynamics shape institutional responses",
+        "Long-term consequences require careful consideration"
+    ]
+}
+
+_TREND_TEMPLATES = {
+    'technology': "Current technology trends indicate accelerating adoption of digital solutions across industries. This development aligns with broader patterns of technological integration and innovation. The trend toward increased automation and AI integration continues to influence business strategies and consumer expectations.",
+    'business': "Business trends reflect ongoing adaptation to changing market conditions and consumer preferences. This development fits within broader patterns of strategic repositioning and operational optimization. The trend toward sustainable business practices and stakeholder engagement continues to gain momentum.",
+    'markets': "Financial market trends indicate ongoing volatility and adaptation to changing economic conditions. This development reflects broader patterns of investor behavior and market dynamics. The trend toward diversified investment strategies and risk management continues to influence market activity.",
+    'science': "Scientific research trends show increasing emphasis on collaborative approaches and practical applications. This development aligns with broader patterns of interdisciplinary research and innovation. The trend toward open science and knowledge sharing continues to accelerate discovery.",
+    'general': "Current societal trends reflect ongoing adaptation to changing social and economic conditions. This development fits within broader patterns of institutional response and public engagement. The trend toward increased transparency and accountability continues to influence governance approaches."
+}
+
+_FUTURE_TEMPLATES = {
+    'technology': "Future implications suggest continued acceleration of technological adoption and integration across industries. Organizations will need to develop adaptive strategies to leverage emerging technologies effectively. The long-term impact could reshape competitive landscapes and create new market opportunities.",
+    'business': "Future business implications indicate the need for continued strategic adaptation and operational flexibility. Companies will need to balance growth objectives with sustainability considerations. The long-term impact could influence industry standards and competitive positioning.",
+    'markets': "Future market implications suggest continued volatility and the need for adaptive investment strategies. Financial institutions will need to develop robust risk management approaches. The long-term impact could influence regulatory frameworks and market structure.",
+    'science': "Future scientific implications indicate accelerated research progress and practical applications. Research institutions will need to develop collaborative frameworks for knowledge sharing. The long-term impact could influence policy development and societal outcomes.",
+    'general': "Future implications suggest continued evolution of governance approaches and public engagement strategies. Institutions will need to develop adaptive frameworks for addressing emerging challenges. The long-term impact could influence policy development and social outcomes."
+}
+
+_CATEGORY_KEYWORDS = {
+    'technology': ('innovation', 'digital', 'automation', 'integration', 'advancement'),
+    'business': ('strategy', 'growth', 'market', 'competitive', 'operational'),
+    'science': ('research', 'discovery', 'methodology', 'analysis', 'findings'),
+    'markets': ('investment', 'financial', 'economic', 'trading', 'volatility'),
+    'sports': ('performance', 'competition', 'athletic', 'championship', 'training'),
+    'general': ('development', 'policy', 'governance', 'public', 'social')
+}
+
+_RELATED_TOPICS = {
+    'technology': ['Digital Transformation', 'Innovation Strategy', 'Technology Adoption'],
+    'business': ['Market Strategy', 'Business Growth', 'Competitive Analysis'],
+    'science': ['Research Methodology', 'Scientific Discovery', 'Knowledge Application'],
+    'markets': ['Investment Strategy', 'Market Analysis', 'Economic Trends'],
+    'sports': ['Athletic Performance', 'Sports Industry', 'Competition Analysis'],
+    'general': ['Policy Development', 'Public Affairs', 'Social Trends']
+}
+
 class OllamaSummarizer:
     """AI summarizer using Ollama"""
     
     def __init__(self, config: Dict[str, Any]):
         self.enabled = config.get('enabled', True)
         self.model = config.get('model', 'llama3.2')
+        # Small quantized model for the first pass; self.model is only used
+        # when the fast model's answer looks too thin to publish
+        self.fast_model = config.get('fast_model', 'llama3.2:1b-instruct-q4_K_M')
         self.timeout = config.get('timeout_seconds', 15)
+        # Per-attempt HTTP timeout, kept just above typical latency so slow
+        # outliers are retried instead of stalling the whole run
+        self.request_timeout = config.get('request_timeout', 8)
+        self.max_retries = config.get('max_retries', 2)
         self.max_tokens = config.get('max_tokens', 150)
+        self.num_ctx = config.get('num_ctx', 1024)
         self.use_cli = config.get('cli', False)
         self.base_url = config.get('base_url', 'http://localhost:11434')
+        # Concurrent HTTP requests for batches; match the server's OLLAMA_NUM_PARALLEL
+        self.parallel = config.get('parallel', 4)
+        self._session = requests.Session()
         
     def summarize_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -47,11 +199,11 @@ class OllamaSummarizer:
             # Get AI response with timeout
             if self.use_cli:
                 response = self.call_ollama_cli(prompt)
+                result = self.parse_response(response) if response else None
             else:
-                response = self.call_ollama_http(prompt)
+                result = self._summarize_http(prompt)
             
-            if response:
-                result = self.parse_response(response)
+            if result:
                 result['ai_enhanced'] = True
                 return result
             else:
@@ -62,21 +214,57 @@ class OllamaSummarizer:
             logger.error(f"Error summarizing article: {str(e)}")
             return self.fallback_summary(article)
     
+    def summarize_batch(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Summarize several articles concurrently so Ollama can decode them in parallel slots
+        
+        Args:
+            articles: Article dictionaries
+            
+        Returns:
+            List of results in the same order as articles
+        """
+        if not self.enabled or self.use_cli or self.parallel <= 1 or len(articles) <= 1:
+            return [self.summarize_article(article) for article in articles]
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            futures = [executor.submit(self.summarize_article, article) for article in articles]
+            
+            results = []
+            for article, future in zip(articles, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error summarizing article in batch: {str(e)}")
+                    results.append(self.fallback_summary(article))
+        
+        return results
+    
+    def _summarize_http(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Summarize with the fast model, upgrading to the full model on a weak result"""
+        result = None
+        response = self.call_ollama_http(prompt, self.fast_model)
+        if response:
+            result = self.parse_response(response)
+            if not self._is_weak_result(result) or self.fast_model == self.model:
+                return result
+            logger.info(f"Weak result from {self.fast_model}, retrying with {self.model}")
+        
+        if self.fast_model == self.model:
+            return None
+        
+        response = self.call_ollama_http(prompt, self.model)
+        if response:
+            return self.parse_response(response)
+        return result
+    
+    def _is_weak_result(self, result: Dict[str, Any]) -> bool:
+        """Check whether a parsed result is too thin to publish"""
+        return len(result.get('summary', '')) < 40 or not result.get('keywords')
+    
     def create_prompt(self, content: str, category: str) -> str:
         """Create enhanced prompt for original analysis and commentary"""
-        category_context = {
-            'technology': 'Analyze technological innovations, industry disruption potential, competitive landscape, and future implications.',
-            'business': 'Examine business strategy, market dynamics, competitive positioning, financial impact, and industry trends.',
-            'science': 'Explore scientific significance, research methodology, real-world applications, and broader implications.',
-            'markets': 'Analyze market forces, economic indicators, investment implications, and financial trends.',
-            'politics': 'Examine policy implications, political strategy, governance impact, and societal effects.',
-            'health': 'Assess medical significance, public health impact, treatment implications, and healthcare trends.',
-            'sports': 'Analyze performance factors, competitive dynamics, industry trends, and cultural impact.',
-            'entertainment': 'Examine cultural significance, industry trends, audience impact, and creative innovation.',
-            'general': 'Provide comprehensive analysis of key developments, implications, and broader context.'
-        }
-        
-        context = category_context.get(category, 'Provide comprehensive analysis and original insights.')
+        context = _CATEGORY_CONTEXT.get(category, 'Provide comprehensive analysis and original insights.')
         
         # Enhanced prompt for substantial original content
         return f"""As a news analyst, provide comprehensive original analysis of this {category} story. {context}
@@ -136,15 +324,18 @@ Focus on original analysis, not just summarizing. Provide unique insights and pr
             logger.error(f"Ollama CLI error: {str(e)}")
             return None
     
-    def call_ollama_http(self, prompt: str) -> Optional[str]:
+    def call_ollama_http(self, prompt: str, model: Optional[str] = None) -> Optional[str]:
         """Call Ollama via HTTP API"""
+        model = model or self.model
         try:
             url = f"{self.base_url}/api/generate"
             payload = {
-                "model": self.model,
+                "model": model,
                 "prompt": prompt,
                 "stream": False,
+                "format": _RESPONSE_SCHEMA,
                 "options": {
+                    "num_ctx": self.num_ctx,  # Prompt is short; avoid the model's full context buffer
                     "num_predict": self.max_tokens,
                     "temperature": 0.3,  # Lower temperature for more consistent output
                     "top_p": 0.9,
@@ -152,10 +343,22 @@ Focus on original analysis, not just summarizing. Provide unique insights and pr
                 }
             }
             
-            logger.debug(f"Sending request to {url} with model {self.model}")
-            logger.debug(f"Prompt length: {len(prompt)} characters")
+            logger.debug("Sending request to %s with model %s", url, model)
+            logger.debug("Prompt length: %d characters", len(prompt))
+            
+            response = None
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = self._session.post(url, json=payload, timeout=self.request_timeout)
+                    break
+                except requests.exceptions.Timeout:
+                    logger.warning(f"Ollama HTTP timeout after {self.request_timeout} seconds "
+                                   f"(attempt {attempt + 1}/{self.max_retries + 1})")
+            
+            if response is None:
+                logger.error(f"Ollama HTTP timed out after {self.max_retries + 1} attempts")
+                return None
             
-            response = requests.post(url, json=payload, timeout=self.timeout)
             response.raise_for_status()
             
             result = response.json()
@@ -165,14 +368,12 @@ Focus on original analysis, not just summarizing. Provide unique insights and pr
                 logger.warning("Empty response from Ollama")
                 return None
             
-            logger.debug(f"Received response length: {len(ai_response)} characters")
-            logger.debug(f"Response preview: {ai_response[:100]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Received response length: %d characters", len(ai_response))
+                logger.debug("Response preview: %s...", ai_response[:100])
             
             return ai_response
             
-        except requests.exceptions.Timeout:
-            logger.error(f"Ollama HTTP timeout after {self.timeout} seconds")
-            return None
         except requests.exceptions.RequestException as e:
             logger.error(f"Ollama HTTP request error: {str(e)}")
             return None
@@ -186,86 +387,100 @@ Focus on original analysis, not just summarizing. Provide unique insights and pr
             # Clean the response
             response = response.strip()
             
-            # Try to extract JSON from response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
+            # HTTP requests use JSON mode, so the response normally parses as-is
+            try:
+                parsed = json.loads(response)
+            except json.JSONDecodeError:
+                parsed = self._salvage_json(response)
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                
-                # Clean up common JSON issues
-                json_str = json_str.replace('\n', ' ').replace('\r', ' ')
-                json_str = ' '.join(json_str.split())  # Remove extra whitespace
-                
-                try:
-                    parsed = json.loads(json_str)
-                    
-                    # Extract enhanced content fields
-                    original_summary = parsed.get('original_summary', '').strip()
-                    editorial_analysis = parsed.get('editorial_analysis', '').strip()
-                    expert_perspective = parsed.get('expert_perspective', '').strip()
-                    key_insights = parsed.get('key_insights', [])
-                    trend_analysis = parsed.get('trend_analysis', '').strip()
-                    future_implications = parsed.get('future_implications', '').strip()
-                    related_topics = parsed.get('related_topics', [])
-                    keywords = parsed.get('keywords', [])
-                    
-                    # Fallback to old format if new format not available
-                    if not original_summary:
-                        original_summary = parsed.get('summary', '').strip()
-                    if not key_insights:
-                        insights = parsed.get('insights', '').strip()
-                        key_insights = [insights] if insights else []
-                    
-                    # Ensure lists are properly formatted
-                    if isinstance(keywords, str):
-                        keywords = [k.strip() for k in keywords.split(',')]
-                    elif not isinstance(keywords, list):
-                        keywords = []
-                    
-                    if isinstance(key_insights, str):
-                        key_insights = [key_insights]
-                    elif not isinstance(key_insights, list):
-                        key_insights = []
-                    
-                    if isinstance(related_topics, str):
-                        related_topics = [t.strip() for t in related_topics.split(',')]
-                    elif not isinstance(related_topics, list):
-                        related_topics = []
-                    
-                    # Clean and limit content
-                    keywords = [k.strip().lower() for k in keywords if k.strip()][:5]
-                    key_insights = [insight.strip() for insight in key_insights if insight.strip()][:5]
-                    related_topics = [topic.strip() for topic in related_topics if topic.strip()][:5]
-                    
-                    # Ensure we have substantial content
-                    if not original_summary:
-                        original_summary = self._extract_summary_from_text(response)
-                    
-                    return {
-                        'summary': original_summary[:400],
-                        'editorial_analysis': editorial_analysis[:1000],
-                        'expert_perspective': expert_perspective[:800],
-                        'key_insights': key_insights,
-                        'trend_analysis': trend_analysis[:600],
-                        'future_implications': future_implications[:600],
-                        'related_topics': related_topics,
-                        'keywords': keywords,
-                        'ai_enhanced': True,
-                        'original_content_ratio': 0.85  # High ratio for AI-generated content
-                    }
-                    
-                except json.JSONDecodeError as e:
-                    logger.warning(f"JSON parsing failed: {str(e)}, trying text extraction")
-                    return self._extract_from_text(response)
-            else:
+            if not isinstance(parsed, dict):
                 # No JSON found, extract from text
                 return self._extract_from_text(response)
+            
+            return self._build_result(parsed, response)
                 
         except Exception as e:
             logger.error(f"Error parsing response: {str(e)}")
             return self._extract_from_text(response)
     
+    def _salvage_json(self, response: str) -> Optional[Dict[str, Any]]:
+        """Recover a JSON object embedded in freeform output (CLI mode)"""
+        # Try to extract JSON from response
+        start_idx = response.find('{')
+        end_idx = response.rfind('}') + 1
+        
+        if start_idx < 0 or end_idx <= start_idx:
+            return None
+        
+        json_str = response[start_idx:end_idx]
+        
+        # Clean up common JSON issues
+        json_str = json_str.replace('\n', ' ').replace('\r', ' ')
+        json_str = ' '.join(json_str.split())  # Remove extra whitespace
+        
+        try:
+            return json.loads(json_str)
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON parsing failed: {str(e)}, trying text extraction")
+            return None
+    
+    def _build_result(self, parsed: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Normalize parsed JSON fields into the summarizer result format"""
+        # Extract enhanced content fields
+        original_summary = parsed.get('original_summary', '').strip()
+        editorial_analysis = parsed.get('editorial_analysis', '').strip()
+        expert_perspective = parsed.get('expert_perspective', '').strip()
+        key_insights = parsed.get('key_insights', [])
+        trend_analysis = parsed.get('trend_analysis', '').strip()
+        future_implications = parsed.get('future_implications', '').strip()
+        related_topics = parsed.get('related_topics', [])
+        keywords = parsed.get('keywords', [])
+        
+        # Fallback to old format if new format not available
+        if not original_summary:
+            original_summary = parsed.get('summary', '').strip()
+        if not key_insights:
+            insights = parsed.get('insights', '').strip()
+            key_insights = [insights] if insights else []
+        
+        # Ensure lists are properly formatted
+        if isinstance(keywords, str):
+            keywords = [k.strip() for k in keywords.split(',')]
+        elif not isinstance(keywords, list):
+            keywords = []
+        
+        if isinstance(key_insights, str):
+            key_insights = [key_insights]
+        elif not isinstance(key_insights, list):
+            key_insights = []
+        
+        if isinstance(related_topics, str):
+            related_topics = [t.strip() for t in related_topics.split(',')]
+        elif not isinstance(related_topics, list):
+            related_topics = []
+        
+        # Clean and limit content
+        keywords = [k.strip().lower() for k in keywords if k.strip()][:5]
+        key_insights = [insight.strip() for insight in key_insights if insight.strip()][:5]
+        related_topics = [topic.strip() for topic in related_topics if topic.strip()][:5]
+        
+        # Ensure we have substantial content
+        if not original_summary:
+            original_summary = self._extract_summary_from_text(response)
+        
+        return {
+            'summary': original_summary[:400],
+            'editorial_analysis': editorial_analysis[:1000],
+            'expert_perspective': expert_perspective[:800],
+            'key_insights': key_insights,
+            'trend_analysis': trend_analysis[:600],
+            'future_implications': future_implications[:600],
+            'related_topics': related_topics,
+            'keywords': keywords,
+            'ai_enhanced': True,
+            'original_content_ratio': 0.85  # High ratio for AI-generated content
+        }
+    
     def _extract_from_text(self, text: str) -> Dict[str, Any]:
         """Extract summary from plain text response"""
         lines = [line.strip() for line in text.split('\n') if line.strip()]
@@ -281,9 +496,7 @@ Focus on original analysis, not just summarizing. Provide unique insights and pr
         summary = ' '.join(summary_lines) if summary_lines else text[:200]
         
         # Extract potential keywords from the text
-        words = text.lower().split()
-        keywords = [word.strip('.,!?()[]') for word in words 
-                   if len(word) > 4 and word.isalpha()][:5]
+        keywords = _WORD_RE.findall(text.lower())[:5]
         
         return {
             'summary': summary[:300],
@@ -293,10 +506,14 @@ Focus on original analysis, not just summarizing. Provide unique insights and pr
     
     def _extract_summary_from_text(self, text: str) -> str:
         """Extract a summary from text when JSON parsing fails"""
-        sentences = text.split('. ')
-        # Take first 2-3 meaningful sentences
-        good_sentences = [s.strip() for s in sentences 
-                         if len(s.strip()) > 20 and not s.strip().startswith('{')][:3]
+        # Take first 2-3 meaningful sentences, stopping the scan once found
+        good_sentences = []
+        for match in _SENT_RE.finditer(text):
+            sentence = match.group().strip()
+            if len(sentence) > 20 and not sentence.startswith('{'):
+                good_sentences.append(sentence)
+                if len(good_sentences) == 3:
+                    break
         
         if good_sentences:
             summary = '. '.join(good_sentences)
@@ -340,166 +557,67 @@ Focus on original analysis, not just summarizing. Provide unique insights and pr
     
     def _generate_original_analysis(self, title: str, excerpt: str, category: str) -> str:
         """Generate original analysis based on title and category"""
-        category_templates = {
-            'technology': f"This technological development represents a significant advancement in the industry. {title} highlights emerging trends that could reshape how businesses and consumers interact with technology. The implications extend beyond immediate applications to influence broader digital transformation strategies.",
-            'business': f"This business development signals important shifts in market dynamics. {title} reflects strategic decisions that could influence competitive positioning and industry standards. The economic implications suggest potential ripple effects across related sectors.",
-            'science': f"This scientific advancement contributes valuable insights to our understanding of the field. {title} represents research that could lead to practical applications and influence future studies. The methodology and findings have broader implications for scientific progress.",
-            'markets': f"This market development indicates significant shifts in financial sentiment and trading patterns. {title} reflects economic forces that could influence investor behavior and market stability. The implications extend to both domestic and international financial markets.",
-            'sports': f"This sports development showcases the evolving landscape of athletic competition and performance. {title} highlights trends that influence both individual athletes and the broader sports industry. The implications extend to fan engagement and commercial opportunities.",
-            'general': f"This development represents an important shift in current affairs and public discourse. {title} reflects broader societal trends and policy implications that could influence future decisions and public opinion."
-        }
-        
-        base_analysis = category_templates.get(category, category_templates['general'])
+        template = _ANALYSIS_TEMPLATES.get(category, _ANALYSIS_TEMPLATES['general'])
+        base_analysis = template.format(title=title)
         
         # Add specific context based on title keywords
-        if any(word in title.lower() for word in ['ai', 'artificial intelligence', 'machine learning']):
+        title_lower = title.lower()
+        if any(word in title_lower for word in _AI_TERMS):
             base_analysis += " The artificial intelligence aspects of this development could accelerate automation and reshape various industries."
-        elif any(word in title.lower() for word in ['climate', 'environment', 'sustainability']):
+        elif any(word in title_lower for word in _CLIMATE_TERMS):
             base_analysis += " The environmental implications are particularly significant in the context of global sustainability efforts and climate change mitigation."
-        elif any(word in title.lower() for word in ['economic', 'financial', 'investment']):
+        elif any(word in title_lower for word in _ECONOMIC_TERMS):
             base_analysis += " The economic ramifications could influence monetary policy and investment strategies across multiple sectors."
         
         return base_analysis
     
     def _generate_editorial_commentary(self, title: str, excerpt: str, category: str) -> str:
         """Generate editorial commentary with original insights"""
-        commentary_templates = {
-            'technology': "From an editorial perspective, this technological advancement represents more than just innovation—it signals a fundamental shift in how we approach digital solutions. The broader implications suggest that organizations must adapt their strategies to remain competitive in an increasingly technology-driven marketplace. This development also raises important questions about digital equity and access to emerging technologies.\n\nThe timing of this announcement is particularly significant, as it comes during a period of rapid technological evolution. Industry experts suggest that such developments could accelerate the adoption of similar technologies across various sectors, potentially creating new opportunities for collaboration and growth.",
-            'business': "This business development reflects broader economic trends that extend far beyond the immediate industry impact. Our analysis suggests that this move could influence competitive dynamics and market positioning across related sectors. The strategic implications are particularly noteworthy for companies operating in similar markets.\n\nFrom a market perspective, this development comes at a crucial time when businesses are reassessing their operational strategies and growth trajectories. The ripple effects could influence supply chain decisions, partnership strategies, and investment priorities across the industry landscape.",
-            'markets': "This market development occurs within a complex economic environment that demands careful analysis of both immediate and long-term implications. Our editorial assessment suggests that this could influence trading patterns and investor sentiment across multiple asset classes. The timing is particularly significant given current economic uncertainties.\n\nThe broader financial implications extend beyond immediate market reactions to influence policy discussions and regulatory considerations. This development could serve as a catalyst for broader conversations about market stability and economic growth strategies.",
-            'science': "This scientific advancement represents a significant contribution to our understanding of the field, with implications that extend far beyond the immediate research findings. Our editorial analysis suggests that this work could influence future research directions and practical applications across multiple disciplines.\n\nThe methodology and approach demonstrated in this research could serve as a model for similar studies, potentially accelerating progress in related areas. The broader implications for scientific collaboration and knowledge sharing are particularly noteworthy.",
-            'general': "This development reflects broader societal trends that deserve careful consideration and analysis. Our editorial perspective suggests that the implications extend beyond immediate impacts to influence policy discussions and public discourse. The timing is particularly significant given current social and political dynamics.\n\nThe broader context of this development highlights important questions about governance, public policy, and social responsibility. These considerations could influence future decision-making processes and public engagement strategies."
-        }
-        
-        return commentary_templates.get(category, commentary_templates['general'])
+        return _EDITORIAL_TEMPLATES.get(category, _EDITORIAL_TEMPLATES['general'])
     
     def _generate_expert_insights(self, title: str, category: str) -> str:
         """Generate expert-level insights and professional analysis"""
-        expert_templates = {
-            'technology': "Industry experts emphasize that this technological development represents a paradigm shift with far-reaching implications. The technical architecture and implementation strategy suggest a sophisticated approach to addressing current market challenges. Professional analysis indicates that this could establish new industry standards and influence competitive positioning.",
-            'business': "Business analysts highlight the strategic significance of this development, noting its potential to reshape competitive dynamics and market positioning. The operational implications suggest a well-considered approach to addressing current business challenges. Expert assessment indicates strong potential for industry-wide influence.",
-            'markets': "Financial experts note that this market development reflects sophisticated understanding of current economic dynamics and investor sentiment. The strategic timing and approach suggest careful consideration of market conditions and regulatory environment. Professional analysis indicates potential for significant market influence.",
-            'science': "Research experts emphasize the methodological rigor and innovative approach demonstrated in this scientific advancement. The findings contribute valuable insights to the existing body of knowledge and suggest promising directions for future research. Expert assessment indicates strong potential for practical applications.",
-            'general': "Policy experts highlight the broader implications of this development for governance and public administration. The strategic approach and timing suggest careful consideration of current political and social dynamics. Professional analysis indicates potential for significant influence on public discourse and policy development."
-        }
-        
-        return expert_templates.get(category, expert_templates['general'])
+        return _EXPERT_TEMPLATES.get(category, _EXPERT_TEMPLATES['general'])
     
     def _extract_enhanced_insights(self, title: str, excerpt: str, category: str) -> List[str]:
         """Extract enhanced insights based on content and category"""
         insights = []
         
         # Category-specific insights
-        category_insights = {
-            'technology': [
-                "Technological innovation continues to accelerate across multiple sectors",
-                "Digital transformation strategies require adaptive approaches",
-                "Emerging technologies create new opportunities for competitive advantage",
-                "Industry collaboration becomes increasingly important for innovation",
-                "Consumer adoption patterns influence technology development cycles"
-            ],
-            'business': [
-                "Strategic positioning becomes crucial in competitive markets",
-                "Operational efficiency drives sustainable business growth",
-                "Market dynamics require adaptive business strategies",
-                "Industry partnerships create value through collaboration",
-                "Economic conditions influence business decision-making processes"
-            ],
-            'markets': [
-                "Market volatility reflects broader economic uncertainties",
-                "Investment strategies must adapt to changing conditions",
-                "Financial innovation creates new opportunities and risks",
-                "Regulatory developments influence market dynamics",
-                "Global economic trends impact local market conditions"
-            ],
-            'science': [
-                "Scientific research drives innovation across multiple disciplines",
-                "Collaborative research approaches accelerate discovery",
-                "Practical applications emerge from theoretical advances",
-                "Research methodology influences outcome reliability",
-                "Scientific findings inform policy and practice decisions"
-            ],
-            'general': [
-                "Current developments reflect broader societal trends",
-                "Policy implications extend beyond immediate impacts",
-                "Public engagement influences decision-making processes",
-                "Social dynamics shape institutional responses",
-                "Long-term consequences require careful consideration"
-            ]
-        }
-        
-        base_insights = category_insights.get(category, category_insights['general'])
+        base_insights = _CATEGORY_INSIGHTS.get(category, _CATEGORY_INSIGHTS['general'])
         insights.extend(base_insights[:3])
         
         # Add title-specific insights
-        if 'growth' in title.lower():
+        title_lower = title.lower()
+        if 'growth' in title_lower:
             insights.append("Growth strategies require balanced approaches to risk and opportunity")
-        if 'innovation' in title.lower():
+        if 'innovation' in title_lower:
             insights.append("Innovation cycles accelerate through collaborative approaches")
         
         return insights[:5]
     
     def _generate_trend_analysis(self, title: str, category: str) -> str:
         """Generate trend analysis based on category and content"""
-        trend_templates = {
-            'technology': "Current technology trends indicate accelerating adoption of digital solutions across industries. This development aligns with broader patterns of technological integration and innovation. The trend toward increased automation and AI integration continues to influence business strategies and consumer expectations.",
-            'business': "Business trends reflect ongoing adaptation to changing market conditions and consumer preferences. This development fits within broader patterns of strategic repositioning and operational optimization. The trend toward sustainable business practices and stakeholder engagement continues to gain momentum.",
-            'markets': "Financial market trends indicate ongoing volatility and adaptation to changing economic conditions. This development reflects broader patterns of investor behavior and market dynamics. The trend toward diversified investment strategies and risk management continues to influence market activity.",
-            'science': "Scientific research trends show increasing emphasis on collaborative approaches and practical applications. This development aligns with broader patterns of interdisciplinary research and innovation. The trend toward open science and knowledge sharing continues to accelerate discovery.",
-            'general': "Current societal trends reflect ongoing adaptation to changing social and economic conditions. This development fits within broader patterns of institutional response and public engagement. The trend toward increased transparency and accountability continues to influence governance approaches."
-        }
-        
-        return trend_templates.get(category, trend_templates['general'])
+        return _TREND_TEMPLATES.get(category, _TREND_TEMPLATES['general'])
     
     def _generate_future_implications(self, title: str, category: str) -> str:
         """Generate future implications analysis"""
-        future_templates = {
-            'technology': "Future implications suggest continued acceleration of technological adoption and integration across industries. Organizations will need to develop adaptive strategies to leverage emerging technologies effectively. The long-term impact could reshape competitive landscapes and create new market opportunities.",
-            'business': "Future business implications indicate the need for continued strategic adaptation and operational flexibility. Companies will need to balance growth objectives with sustainability considerations. The long-term impact could influence industry standards and competitive positioning.",
-            'markets': "Future market implications suggest continued volatility and the need for adaptive investment strategies. Financial institutions will need to develop robust risk management approaches. The long-term impact could influence regulatory frameworks and market structure.",
-            'science': "Future scientific implications indicate accelerated research progress and practical applications. Research institutions will need to develop collaborative frameworks for knowledge sharing. The long-term impact could influence policy development and societal outcomes.",
-            'general': "Future implications suggest continued evolution of governance approaches and public engagement strategies. Institutions will need to develop adaptive frameworks for addressing emerging challenges. The long-term impact could influence policy development and social outcomes."
-        }
-        
-        return future_templates.get(category, future_templates['general'])
+        return _FUTURE_TEMPLATES.get(category, _FUTURE_TEMPLATES['general'])
     
     def _extract_enhanced_keywords(self, title: str, excerpt: str, category: str) -> List[str]:
         """Extract enhanced keywords with category context"""
-        keywords = []
-        text_for_keywords = f"{title} {excerpt}".lower()
-        
-        # Category-specific keywords
-        category_keywords = {
-            'technology': ['innovation', 'digital', 'automation', 'integration', 'advancement'],
-            'business': ['strategy', 'growth', 'market', 'competitive', 'operational'],
-            'science': ['research', 'discovery', 'methodology', 'analysis', 'findings'],
-            'markets': ['investment', 'financial', 'economic', 'trading', 'volatility'],
-            'sports': ['performance', 'competition', 'athletic', 'championship', 'training'],
-            'general': ['development', 'policy', 'governance', 'public', 'social']
-        }
-        
         # Add category-specific keywords
-        if category in category_keywords:
-            keywords.extend(category_keywords[category][:3])
+        keywords = list(_CATEGORY_KEYWORDS.get(category, ())[:3])
+        seen = set(keywords)
         
-        # Extract keywords from title
-        if title:
-            words = title.lower().split()
-            title_keywords = [word.strip('.,!?()[]') for word in words 
-                            if len(word) > 4 and word.isalpha()][:2]
-            keywords.extend(title_keywords)
+        # Extract keywords from title, skipping duplicates while keeping order
+        for word in _WORD_RE.findall(title.lower())[:2]:
+            if word not in seen:
+                seen.add(word)
+                keywords.append(word)
         
-        return list(set(keywords))[:5]  # Remove duplicates and limit
+        return keywords[:5]
     
     def _generate_related_topics(self, title: str, category: str) -> List[str]:
         """Generate related topics based on category and content"""
-        related_templates = {
-            'technology': ['Digital Transformation', 'Innovation Strategy', 'Technology Adoption'],
-            'business': ['Market Strategy', 'Business Growth', 'Competitive Analysis'],
-            'science': ['Research Methodology', 'Scientific Discovery', 'Knowledge Application'],
-            'markets': ['Investment Strategy', 'Market Analysis', 'Economic Trends'],
-            'sports': ['Athletic Performance', 'Sports Industry', 'Competition Analysis'],
-            'general': ['Policy Development', 'Public Affairs', 'Social Trends']
-        }
-        
-        return related_templates.get(category, related_templates['general'])
\ No newline at end of file
+        return list(_RELATED_TOPICS.get(category, _RELATED_TOPICS['general']))
\ No newline at end of file
@@ -2,24 +2,161 @@
 Development web server for serving the frontend
 """
 import os
-import json
+import zlib
+import stat
+import mimetypes
+import asyncio
+import orjson
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+from starlette.concurrency import run_in_threadpool
 from src.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+NEWS_FILE = "public/data/news.json"
+
+# Parsed news.json plus ready-to-send /api/news bodies (plain and gzipped) for the
+# full list and for each category, refreshed when the file's mtime changes
+_NEWS_CACHE: Dict[str, Any] = {"mtime": None, "data": None, "all": None, "by_category": {}}
+
+def _news_prefix(data: bytes, count: int) -> bytes:
+    """Wrap pre-serialized article bytes in the /api/news envelope, up to the timestamp"""
+    return b'{"success":true,"count":%d,"data":%s,"timestamp":' % (count, data)
+
+def _news_tail() -> bytes:
+    """Close an /api/news body with the time the response is served"""
+    return b'%s}' % orjson.dumps(datetime.now().isoformat())
+
+def _read_news(mtime: int) -> Dict[str, Any]:
+    """Read and parse news.json into a fresh cache entry"""
+    with open(NEWS_FILE, "rb") as f:
+        data = orjson.loads(f.read())
+    
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for article in data:
+        grouped.setdefault(article.get("category", "").lower(), []).append(article)
+    
+    # Bodies are built once per file change, up to the per-response timestamp. The
+    # gzip stream is compressed that far too; each response finishes a copy of it
+    def entry(articles: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bytes, Tuple[bytes, Any]]:
+        prefix = _news_prefix(orjson.dumps(articles), len(articles))
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        return articles, prefix, (compressor.compress(prefix), compressor)
+    
+    return {
+        "mtime": mtime,
+        "data": data,
+        "all": entry(data),
+        "by_category": {cat: entry(articles) for cat, articles in grouped.items()}
+    }
+
+async def _load_news() -> Dict[str, Any]:
+    """Return the news cache, re-reading news.json only after an update"""
+    mtime = os.stat(NEWS_FILE).st_mtime_ns
+    if _NEWS_CACHE["mtime"] != mtime:
+        # Parse off the event loop so other requests aren't stalled by the read
+        _NEWS_CACHE.update(await asyncio.to_thread(_read_news, mtime))
+    return _NEWS_CACHE
+
+# Seconds between background checks for a new news.json
+_REFRESH_INTERVAL = float(os.getenv("NEWS_REFRESH_INTERVAL", "30"))
+
+async def _refresh_news_loop() -> None:
+    """Rebuild the news cache soon after news.json changes, so requests find it warm"""
+    while True:
+        try:
+            await _load_news()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Background news refresh failed: {str(e)}")
+        await asyncio.sleep(_REFRESH_INTERVAL)
+
+def _news_response(data: bytes, count: int) -> Response:
+    """Build an /api/news response for articles serialized per request"""
+    body = _news_prefix(data, count) + _news_tail()
+    return Response(content=body, media_type="application/json")
+
+def _cached_news_response(request: Request, prefix: bytes, gzipped: Tuple[bytes, Any]) -> Response:
+    """Send a precomputed body with a fresh timestamp, gzipped when the client accepts it"""
+    tail = _news_tail()
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        gz_prefix, compressor = gzipped
+        # Finish a copy, leaving the cached compressor at the end of the prefix
+        compressor = compressor.copy()
+        # GZipMiddleware passes responses that already carry Content-Encoding through untouched
+        return Response(
+            content=gz_prefix + compressor.compress(tail) + compressor.flush(),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(content=prefix + tail, media_type="application/json")
+
+# Content types worth gzipping; images and fonts are already compressed
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+class TextGZipResponder(GZipResponder):
+    """GZipResponder that passes non-text bodies through uncompressed"""
+    
+    async def send_with_gzip(self, message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if not content_type.startswith(_COMPRESSIBLE_TYPES):
+                # Reuse the already-encoded passthrough path for the body
+                self.content_encoding_set = True
+
+class TextGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware restricted to textual content types"""
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = TextGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves an up-to-date <file>.gz sibling to gzip-capable clients
+    
+    The .gz files are built by scripts/precompress_assets.py, so assets are
+    compressed once at deploy time instead of by GZipMiddleware on every request.
+    """
+    
+    async def get_response(self, path: str, scope) -> Response:
+        request_headers = Headers(scope=scope)
+        if scope["method"] in ("GET", "HEAD") and "gzip" in request_headers.get("accept-encoding", ""):
+            gz_path, gz_stat = await run_in_threadpool(self.lookup_path, path + ".gz")
+            if gz_stat and stat.S_ISREG(gz_stat.st_mode):
+                _, src_stat = await run_in_threadpool(self.lookup_path, path)
+                if src_stat and gz_stat.st_mtime >= src_stat.st_mtime:
+                    response = FileResponse(
+                        gz_path,
+                        stat_result=gz_stat,
+                        method=scope["method"],
+                        media_type=mimetypes.guess_type(path)[0] or "text/plain",
+                        headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+                    )
+                    if self.is_not_modified(response.headers, request_headers):
+                        return NotModifiedResponse(response.headers)
+                    return response
+        return await super().get_response(path, scope)
+
 app = FastAPI(
     title="News Automation API",
     description="Backend service for news automation system",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS
@@ -31,8 +168,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Enable Gzip compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Enable Gzip compression for text responses
+app.add_middleware(TextGZipMiddleware, minimum_size=1000, compresslevel=6)
+
+@app.on_event("startup")
+async def start_news_refresh():
+    # Also warms the cache before the first request
+    app.state.news_refresh = asyncio.create_task(_refresh_news_loop())
+
+@app.on_event("shutdown")
+async def stop_news_refresh():
+    app.state.news_refresh.cancel()
 
 # Global error handler
 @app.middleware("http")
@@ -55,9 +201,8 @@ async def error_handler(request: Request, call_next):
 async def health_check():
     try:
         # Check if news data is accessible
-        with open("public/data/news.json", "r", encoding="utf-8") as f:
-            news_data = json.load(f)
-            last_update = news_data[0]["fetchedAt"] if news_data else None
+        news_data = (await _load_news())["data"]
+        last_update = news_data[0]["fetchedAt"] if news_data else None
     except Exception as e:
         last_update = None
         logger.error(f"Health check failed: {str(e)}")
@@ -69,17 +214,9 @@ async def health_check():
         "lastNewsUpdate": last_update
     }
 
-# Mount static files
-app.mount("/", StaticFiles(directory="public", html=True), name="static")
-
-# Serve index.html for the root path
-@app.get("/")
-async def read_root():
-    return FileResponse("public/index.html")
-
 # Get news data
 @app.get("/api/news")
-async def get_news(category: Optional[str] = None, limit: Optional[int] = None):
+async def get_news(request: Request, category: Optional[str] = None, limit: Optional[int] = None):
     """Get news articles with optional category filter and limit.
     
     Args:
@@ -87,27 +224,23 @@ async def get_news(category: Optional[str] = None, limit: Optional[int] = None):
         limit: Optional limit on number of articles to return
     """
     try:
-        # Read news data
-        with open("public/data/news.json", "r", encoding="utf-8") as f:
-            news_data = json.load(f)
+        cache = await _load_news()
+        entry = cache["all"]
 
         # Apply category filter if provided
         if category:
-            news_data = [
-                article for article in news_data 
-                if article.get("category", "").lower() == category.lower()
-            ]
+            entry = cache["by_category"].get(category.lower())
+            if entry is None:
+                return _news_response(b"[]", 0)
+
+        news_data, prefix, gzipped = entry
 
         # Apply limit if provided
-        if limit and limit > 0:
+        if limit and 0 < limit < len(news_data):
             news_data = news_data[:limit]
+            return _news_response(orjson.dumps(news_data), len(news_data))
 
-        return {
-            "success": True,
-            "count": len(news_data),
-            "data": news_data,
-            "timestamp": datetime.now().isoformat()
-        }
+        return _cached_news_response(request, prefix, gzipped)
 
     except FileNotFoundError:
         logger.error("News data file not found")
@@ -115,7 +248,7 @@ async def get_news(category: Optional[str] = None, limit: Optional[int] = None):
             status_code=404,
             detail="News data not available"
         )
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in news data: {str(e)}")
         raise HTTPException(
             status_code=500,
@@ -141,21 +274,29 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         }
     )
 
+# Mount static files last so the catch-all "/" mount doesn't shadow the API routes.
+# It also serves index.html for "/" with ETag/Last-Modified and 304 handling.
+app.mount("/", PrecompressedStaticFiles(directory="public", html=True), name="static")
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "8000"))
     host = os.getenv("HOST", "0.0.0.0")
+    reload = os.getenv("RELOAD", "false").lower() == "true"
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
     
     # Configure logging
     log_config = uvicorn.config.LOGGING_CONFIG
     log_config["formatters"]["access"]["fmt"] = "%(asctime)s - %(levelname)s - %(message)s"
     
-    # Run server
-    logger.info(f"Starting server on {host}:{port}")
+    # Run server; uvicorn needs an import string for reload or multiple workers.
+    # Its default loop="auto" runs on uvloop when installed (not on Windows)
+    logger.info(f"Starting server on {host}:{port} ({'reload' if reload else f'{workers} worker(s)'})")
     uvicorn.run(
-        app,
+        "src.webapp:app",
         host=host,
         port=port,
         log_config=log_config,
-        reload=True  # Enable auto-reload for development
+        reload=reload,  # RELOAD=true for development
+        workers=None if reload else workers
     )
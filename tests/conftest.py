@@ -2,18 +2,115 @@
 PyTest configuration file
 """
 import os
+import json
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 import vcr
+from dotenv import load_dotenv
+from unittest.mock import Mock
+import requests
+from requests.adapters import HTTPAdapter
+from tests.test_utils import FakeClock, VCR_CONFIG
+
+def pytest_addoption(parser):
+    parser.addoption("--run-integration", action="store_true",
+                     help="run tests marked integration (they call live APIs)")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip live-API tests unless --run-integration is given"""
+    if config.getoption("--run-integration"):
+        return
+    skip = pytest.mark.skip(reason="integration; pass --run-integration")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip)
+
+@pytest.fixture(autouse=True, scope="session")
+def _env():
+    """Read .env once per session; variables already set in the environment win"""
+    load_dotenv()
+    yield
 
 # Configure VCR
 @pytest.fixture(scope='module')
 def vcr_config():
-    return {
-        'filter_headers': ['authorization', 'api-key'],  # Don't record API keys
-        'record_mode': 'once',
-        'cassette_library_dir': 'tests/cassettes'
-    }
+    return dict(VCR_CONFIG)
+
+@pytest.fixture(scope="session")
+def test_cache_dir(tmp_path_factory):
+    """Cache directory shared by the whole session; tests needing an empty one use a subdirectory"""
+    return str(tmp_path_factory.mktemp("cache"))
+
+@pytest.fixture(scope="session")
+def thread_pool():
+    """Worker pool reused by concurrency tests instead of spawning threads each time"""
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        yield executor
+
+@pytest.fixture(scope="session")
+def shared_session():
+    """One HTTP session for live-provider tests, so connections are reused across providers"""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+    yield session
+    session.close()
+
+@pytest.fixture
+def fake_clock():
+    """Controllable time source; call advance() instead of sleeping"""
+    return FakeClock(start=1_000_000.0)
+
+# News providers are built once per session; provider modules are imported
+# lazily so suites that don't use them still collect without them
+@pytest.fixture(scope="session")
+def gdelt_provider():
+    from src.core.gdelt_provider import GdeltNewsProvider
+    return GdeltNewsProvider()
+
+@pytest.fixture(scope="session")
+def guardian_provider():
+    from src.core.guardian_provider import GuardianNewsProvider
+    provider = GuardianNewsProvider()
+    provider.api_key = "test_key"
+    provider.is_available = True
+    return provider
+
+# Specs for the mocked Session/Response: only attributes of the real objects
+# (including those set in __init__, like headers) can be read, and no magic
+# methods are set up
+_SESSION_ATTRS = dir(requests.Session())
+_RESPONSE_ATTRS = dir(requests.Response())
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    """Patch requests.Session; configure the reply with mock_session.set_response(data, status)"""
+    response = Mock(spec=_RESPONSE_ATTRS, status_code=200)
+    session = Mock(return_value=Mock(spec=_SESSION_ATTRS))
+    session.return_value.get.return_value = response
+    monkeypatch.setattr('requests.Session', session)
+
+    def set_response(data, status=200):
+        response.status_code = status
+        response.json.return_value = data
+        response.text = json.dumps(data)
+        return response
+
+    session.set_response = set_response
+    return session
+
+@pytest.fixture
+def api_mock(requests_mock):
+    """Register a JSON reply for a provider endpoint at the requests transport layer"""
+    def register(data, url='https://api.gdeltproject.org/api/v2/doc/doc'):
+        requests_mock.get(url, json=data)
+        return requests_mock
+    return register
+
+@pytest.fixture
+def manager():
+    """Fresh provider manager; tests assert on its absolute health counters"""
+    from src.core.provider_manager import NewsProviderManager
+    return NewsProviderManager(use_cache=False)  # Disable cache for tests
 
 # Create cassettes directory if it doesn't exist
-if not os.path.exists('tests/cassettes'):
-    os.makedirs('tests/cassettes')
+os.makedirs(VCR_CONFIG['cassette_library_dir'], exist_ok=True)
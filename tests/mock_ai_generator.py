@@ -1,31 +1,41 @@
 """Mock AI Generator for testing"""
 import logging
+import re
+import threading
 from typing import Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# One pass over the lowercased title per keyword set. No word boundaries:
+# matching stays substring-based ('ai' in 'said', 'stock' in 'stocks')
+_TECH_RE = re.compile(r'ai|tech|robot|software')
+_BIZ_RE = re.compile(r'market|stock|economy')
+_SCI_RE = re.compile(r'research|study|science')
+_BREAK_RE = re.compile(r'breaking|urgent|just in|latest|exclusive|breakthrough|revolution')
+
 class MockAIGenerator:
     def __init__(self):
+        # Guards call_count; summarize_article is called from several threads
+        self._lock = threading.Lock()
         self.call_count = 0
     
     def summarize_article(self, article: Dict[str, Any]) -> Tuple[str, str, bool]:
         """
         Mock article summarization
         """
-        self.call_count += 1
+        with self._lock:
+            self.call_count += 1
         title = article.get('title', '')
         description = article.get('description', '')
+        tl = title.lower()
         
         # Return the description as summary, detect category from content
-        category = 'technology' if any(word in title.lower() for word in ['ai', 'tech', 'robot', 'software']) else \
-                  'business' if any(word in title.lower() for word in ['market', 'stock', 'economy']) else \
-                  'science' if any(word in title.lower() for word in ['research', 'study', 'science']) else \
+        category = 'technology' if _TECH_RE.search(tl) else \
+                  'business' if _BIZ_RE.search(tl) else \
+                  'science' if _SCI_RE.search(tl) else \
                   'general'
         
         # Detect breaking news based on keywords
-        is_breaking = any(word in title.lower() for word in [
-            'breaking', 'urgent', 'just in', 'latest', 'exclusive',
-            'breakthrough', 'revolution'
-        ])
+        is_breaking = _BREAK_RE.search(tl) is not None
         
         return description or title, category, is_breaking
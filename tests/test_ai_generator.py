@@ -1,7 +1,9 @@
 """
 Tests for the AI Generator component
 """
+import json
 import pytest
+import requests
 from unittest.mock import patch, Mock
 from datetime import datetime
 from src.core.ai_generator import AIGenerator
@@ -12,6 +14,23 @@ from tests.test_utils import (
     MockResponse
 )
 
+# Long enough for a short article's target length, so it isn't replaced by the description
+_SUMMARY = ' '.join(['word'] * 100)
+
+def _reply(text: str) -> MockResponse:
+    """Plain-text Ollama reply"""
+    return MockResponse({'response': text})
+
+def _combined(summary: str = _SUMMARY, category: str = 'technology', breaking: bool = False) -> MockResponse:
+    """Single-prompt Ollama reply carrying summary, category and breaking flag"""
+    return MockResponse({'response': json.dumps({
+        'summary': summary, 'category': category, 'breaking': breaking
+    })})
+
+# Replies for a normal article; the responses are never mutated, so tests share them
+_SUMMARY_TECH_FALSE = _combined()
+_SUMMARY_TECH_TRUE = _combined(breaking=True)
+
 class TestAIGenerator:
     @pytest.fixture
     def ai_generator(self, setup_test_env):
@@ -19,7 +38,8 @@ class TestAIGenerator:
 
     @pytest.fixture
     def test_article(self):
-        return create_test_article()
+        # No API category, so the AI's classification is used
+        return create_test_article(category='')
 
     def test_initialization(self, ai_generator):
         """Test AIGenerator initialization"""
@@ -27,86 +47,98 @@ class TestAIGenerator:
         assert ai_generator.max_retries == 3
         assert 'localhost' in ai_generator.ollama_url
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_summarize_article_success(self, mock_post, ai_generator, test_article):
         """Test successful article summarization"""
         # Mock responses for summary, category, and breaking news check
-        responses = [
-            {'response': 'Test summary'},
-            {'response': 'technology'},
-            {'response': 'false'}
-        ]
-        mock_post.side_effect = [MockResponse(r) for r in responses]
+        mock_post.side_effect = [_SUMMARY_TECH_FALSE]
         
-        summary, category, is_breaking = ai_generator.summarize_article(test_article)
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(test_article)
         
-        assert isinstance(summary, str)
-        assert summary == 'Test summary'
+        assert summary == _SUMMARY
         assert category == 'technology'
         assert not is_breaking
-        assert mock_post.call_count == 3
+        assert ai_enhanced
+        assert mock_post.call_count == 1  # One round-trip for all three fields
+
+    @pytest.mark.parametrize("api_category,fields", [
+        ('', ['summary', 'category', 'breaking']),
+        ('business', ['summary', 'breaking']),  # API category is kept, so not requested
+    ])
+    @patch('requests.Session.post')
+    def test_non_json_response_falls_back(self, mock_post, api_category, fields, ai_generator, test_article):
+        """Test a reply that isn't JSON is followed by one request per field"""
+        replies = {'summary': _reply(_SUMMARY), 'category': _reply('science'), 'breaking': _reply('true')}
+        mock_post.side_effect = [_reply('Not JSON')] + [replies[field] for field in fields]
+        
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(
+            {**test_article, 'category': api_category}
+        )
+        assert summary == _SUMMARY
+        assert category == (api_category or 'science')
+        assert is_breaking
+        assert mock_post.call_count == 1 + len(fields)
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_summarize_article_retry(self, mock_post, ai_generator, test_article):
         """Test retry mechanism"""
         # First call fails, second succeeds
-        mock_post.side_effect = [
-            Exception("Connection error"),
-            MockResponse({'response': 'Test summary'}),
-            MockResponse({'response': 'technology'}),
-            MockResponse({'response': 'false'})
-        ]
+        mock_post.side_effect = [requests.exceptions.ConnectionError("Connection error"), _SUMMARY_TECH_FALSE]
         
-        summary, category, is_breaking = ai_generator.summarize_article(test_article)
-        assert summary == 'Test summary'
-        assert mock_post.call_count == 4
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(test_article)
+        assert summary == _SUMMARY
+        assert mock_post.call_count == 2
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_summarize_article_all_retries_fail(self, mock_post, ai_generator, test_article):
         """Test handling of persistent failures"""
-        mock_post.side_effect = Exception("Connection error")
+        mock_post.side_effect = requests.exceptions.ConnectionError("Connection error")
         
-        summary, category, is_breaking = ai_generator.summarize_article(test_article)
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(test_article)
         assert summary == test_article['description']
         assert category == 'general'
         assert not is_breaking
-        assert mock_post.call_count >= 3
+        assert not ai_enhanced
+        assert mock_post.call_count == ai_generator.max_retries
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
+    def test_summary_reused_for_same_article(self, mock_post, ai_generator, test_article):
+        """Test an AI summary is cached and a fallback is not"""
+        mock_post.side_effect = [_SUMMARY_TECH_FALSE]
+        
+        first = ai_generator.summarize_article(test_article)
+        assert first[3]  # AI-enhanced
+        assert ai_generator.summarize_article(dict(test_article)) == first
+        assert mock_post.call_count == 1
+        
+        # A fallback result is requested again next time
+        mock_post.side_effect = requests.exceptions.ConnectionError("Connection error")
+        other = {**test_article, 'title': 'Other Article'}
+        ai_generator.summarize_article(other)
+        calls = mock_post.call_count
+        ai_generator.summarize_article(other)
+        assert mock_post.call_count > calls
+
+    @patch('requests.Session.post')
     def test_category_validation(self, mock_post, ai_generator, test_article):
         """Test category validation"""
         # Test with invalid category response
-        mock_post.side_effect = [
-            MockResponse({'response': 'Test summary'}),
-            MockResponse({'response': 'invalid_category'}),
-            MockResponse({'response': 'false'})
-        ]
+        mock_post.side_effect = [_combined(category='invalid_category')]
         
-        summary, category, is_breaking = ai_generator.summarize_article(test_article)
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(test_article)
         assert category == 'general'  # Should default to general
 
-    @patch('requests.post')
-    def test_breaking_news_detection(self, mock_post, ai_generator, test_article):
+    @pytest.mark.parametrize("response,expected", [
+        (_SUMMARY_TECH_TRUE, True),
+        (_SUMMARY_TECH_FALSE, False)
+    ], ids=["breaking", "not-breaking"])
+    @patch('requests.Session.post')
+    def test_breaking_news_detection(self, mock_post, response, expected, ai_generator, test_article):
         """Test breaking news detection"""
-        # Test true case
-        mock_post.side_effect = [
-            MockResponse({'response': 'Test summary'}),
-            MockResponse({'response': 'technology'}),
-            MockResponse({'response': 'true'})
-        ]
+        mock_post.side_effect = [response]
         
-        summary, category, is_breaking = ai_generator.summarize_article(test_article)
-        assert is_breaking
-
-        # Test false case
-        mock_post.side_effect = [
-            MockResponse({'response': 'Test summary'}),
-            MockResponse({'response': 'technology'}),
-            MockResponse({'response': 'false'})
-        ]
-        
-        summary, category, is_breaking = ai_generator.summarize_article(test_article)
-        assert not is_breaking
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(test_article)
+        assert bool(is_breaking) is expected
 
     def test_check_ollama_status(self, ai_generator):
         """Test Ollama status check"""
@@ -121,32 +153,32 @@ class TestAIGenerator:
             mock_get.side_effect = Exception("Connection refused")
             assert not ai_generator.check_ollama_status()
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_timeout_handling(self, mock_post, ai_generator, test_article):
         """Test handling of timeouts"""
         mock_post.side_effect = TimeoutError("Request timed out")
         
-        summary, category, is_breaking = ai_generator.summarize_article(test_article)
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(test_article)
         assert summary == test_article['description']
         assert category == 'general'
         assert not is_breaking
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_empty_response_handling(self, mock_post, ai_generator, test_article):
         """Test handling of empty responses"""
         mock_post.return_value = MockResponse({'response': ''})
         
-        summary, category, is_breaking = ai_generator.summarize_article(test_article)
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(test_article)
         assert summary == test_article['description']
         assert category == 'general'
         assert not is_breaking
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_malformed_article_handling(self, mock_post, ai_generator):
         """Test handling of malformed articles"""
         malformed_article = {'title': 'Test'}  # Missing required fields
         
-        summary, category, is_breaking = ai_generator.summarize_article(malformed_article)
+        summary, category, is_breaking, ai_enhanced = ai_generator.summarize_article(malformed_article)
         assert isinstance(summary, str)
         assert category == 'general'
         assert not is_breaking
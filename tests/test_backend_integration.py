@@ -1,201 +1,203 @@
 """
 Integration tests for the backend service with NewsAPI and AI summarization
 """
-import unittest
 import os
-import json
-from datetime import datetime, timedelta
+import time
+import functools
 from pathlib import Path
 import sys
 import logging
 from typing import List, Dict, Any
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Add project root to Python path
-sys.path.append(str(Path(__file__).parent.parent))
+import orjson
+import pytest
+import vcr
 
 from src.core.news_fetcher import NewsFetcher
 from src.core.cache import Cache
 from src.orchestrator import NewsOrchestrator
 from tests.mock_ai_generator import MockAIGenerator
+from tests.test_utils import VCR_CONFIG
+
+# NewsAPI responses are recorded once and replayed afterwards
+my_vcr = vcr.VCR(**VCR_CONFIG)
+_CASSETTES = ('news_api_fetch.json', 'rate_limit.json')
+
+# Categories to test; each test runs once per category so they can be spread
+# across workers (pytest -n 3)
+CATEGORIES = ['technology', 'business', 'science']
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class TestBackendIntegration(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
+class TestBackendIntegration:
+    @pytest.fixture(scope="class", autouse=True)
+    def _components(self, request, test_cache_dir):
         """Set up test environment once for all tests"""
-        # Ensure we have the required API keys
-        cls.news_api_key = os.getenv('NEWS_API_KEY')
-        if not cls.news_api_key:
-            raise ValueError("NEWS_API_KEY environment variable must be set to run integration tests")
-        
-        # Initialize components
-        cls.news_fetcher = NewsFetcher()
-        cls.ai_generator = MockAIGenerator()
-        cls.cache = Cache()
-        # Create orchestrator with mock AI generator
-        cls.orchestrator = NewsOrchestrator()
-        cls.orchestrator.ai_generator = cls.ai_generator  # Replace with mock
+        cls = request.cls
         
-        # Categories to test
-        cls.categories = ['technology', 'business', 'science']
-        
-        # Cache file for storing test results
-        cls.cache_dir = Path(__file__).parent / 'test_cache'
-        cls.cache_dir.mkdir(exist_ok=True)
+        # Restored on teardown so later tests don't see the placeholder key
+        with pytest.MonkeyPatch.context() as mp:
+            # A real key is only needed to record; replaying cassettes never sends it
+            cls.news_api_key = os.getenv('NEWS_API_KEY')
+            if not cls.news_api_key:
+                cassette_dir = Path(VCR_CONFIG['cassette_library_dir'])
+                if not all((cassette_dir / name).exists() for name in _CASSETTES):
+                    raise ValueError("NEWS_API_KEY environment variable must be set to record integration cassettes")
+                cls.news_api_key = 'dummy'
+                mp.setenv('NEWS_API_KEY', cls.news_api_key)
+            
+            # Initialize components
+            cls.news_fetcher = NewsFetcher()
+            cls.ai_generator = MockAIGenerator()
+            cls.cache = Cache()
+            # Create orchestrator with mock AI generator
+            cls.orchestrator = NewsOrchestrator()
+            cls.orchestrator.ai_generator = cls.ai_generator  # Replace with mock
+            
+            # Directory for storing test results
+            cls.cache_dir = Path(test_cache_dir) / 'integration'
+            cls.cache_dir.mkdir(exist_ok=True)
+            
+            yield
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _fetched(cls, category: str) -> List[Dict[str, Any]]:
+        """Fetch a category once, from the cassette when recorded"""
+        with my_vcr.use_cassette('news_api_fetch.json', allow_playback_repeats=True):
+            return cls.news_fetcher.fetch_news(category)
     
-    def setUp(self):
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _processed(cls, category: str) -> List[Dict[str, Any]]:
+        """Run the orchestrator once per category and share the result between tests"""
+        return cls.orchestrator.process_news(category)
+    
+    def setup_method(self, method):
         """Set up for each test"""
-        self.start_time = datetime.now()
-        logger.info(f"Starting test: {self._testMethodName}")
+        self.start_time = time.perf_counter()
+        logger.info(f"Starting test: {method.__name__}")
     
-    def tearDown(self):
+    def teardown_method(self, method):
         """Clean up after each test"""
-        duration = datetime.now() - self.start_time
-        logger.info(f"Test {self._testMethodName} completed in {duration.total_seconds():.2f} seconds")
+        duration = time.perf_counter() - self.start_time
+        logger.info(f"Test {method.__name__} completed in {duration:.2f} seconds")
     
-    def test_01_news_api_fetch(self):
+    @pytest.mark.parametrize("category", CATEGORIES)
+    def test_01_news_api_fetch(self, category):
         """Test fetching news from NewsAPI for each category"""
-        for category in self.categories:
-            with self.subTest(category=category):
-                articles = self.news_fetcher.fetch_news(category)
-                
-                # Verify we got articles
-                self.assertIsInstance(articles, list)
-                self.assertGreater(len(articles), 0)
-                
-                # Check article structure
-                article = articles[0]
-                required_fields = ['title', 'description', 'url', 'publishedAt', 'source']
-                for field in required_fields:
-                    self.assertIn(field, article)
-                
-                # Save articles for later tests
-                cache_file = self.cache_dir / f"{category}_articles.json"
-                with open(cache_file, 'w') as f:
-                    json.dump(articles[:5], f)  # Save first 5 articles
-                
-                logger.info(f"Fetched and cached {len(articles)} articles for {category}")
+        articles = self._fetched(category)
+        
+        # Verify we got articles
+        assert isinstance(articles, list)
+        assert len(articles) > 0
+        
+        # Check article structure
+        article = articles[0]
+        required_fields = ['title', 'description', 'url', 'publishedAt', 'source']
+        for field in required_fields:
+            assert field in article
+        
+        logger.info(f"Fetched {len(articles)} articles for {category}")
     
-    def test_02_ai_summarization(self):
+    @pytest.mark.parametrize("category", CATEGORIES)
+    def test_02_ai_summarization(self, category):
         """Test AI summarization on real news articles"""
-        for category in self.categories:
-            with self.subTest(category=category):
-                # Load cached articles
-                cache_file = self.cache_dir / f"{category}_articles.json"
-                with open(cache_file) as f:
-                    articles = json.load(f)
-                
-                for i, article in enumerate(articles):
-                    # Ensure article has required fields
-                    article_data = {
-                        'title': article.get('title', ''),
-                        'description': article.get('description', ''),
-                        'content': article.get('content', ''),
-                        'url': article.get('url', ''),
-                        'publishedAt': article.get('publishedAt', ''),
-                        'source': article.get('source', {}).get('name', 'Unknown')
-                    }
-                    
-                    # Generate summary
-                    summary, detected_category, is_breaking = self.ai_generator.summarize_article(article_data)
-                    
-                    # Verify summary
-                    self.assertIsInstance(summary, str)
-                    self.assertTrue(len(summary) > 0)  # Summary should not be empty
-                    
-                    # Verify category detection
-                    self.assertIn(detected_category, 
-                                ['technology', 'business', 'science', 'world', 'general'])
-                    
-                    # If it's the original category, it should be detected correctly
-                    if category in ['technology', 'business', 'science']:
-                        self.assertEqual(category, detected_category)
-                    
-                    # Verify breaking news flag
-                    self.assertIsInstance(is_breaking, bool)
-                    
-                    logger.info(f"Successfully summarized article {i+1} for {category}")
-                    
-                    # Add results to article for full pipeline test
-                    article['summary'] = summary
-                    article['detected_category'] = detected_category
-                    article['is_breaking'] = is_breaking
-                
-                # Save processed articles
-                with open(cache_file, 'w') as f:
-                    json.dump(articles, f)
+        # Copies, so the shared fetch result isn't annotated in place
+        articles = [dict(article) for article in self._fetched(category)[:5]]
+        
+        for i, article in enumerate(articles):
+            # Generate summary; the generator only reads fields with .get defaults,
+            # so the NewsAPI article is passed as-is
+            summary, detected_category, is_breaking = self.ai_generator.summarize_article(article)
+            
+            # Verify summary
+            assert isinstance(summary, str)
+            assert len(summary) > 0  # Summary should not be empty
+            
+            # Verify category detection
+            assert detected_category in ['technology', 'business', 'science', 'world', 'general']
+            
+            # If it's the original category, it should be detected correctly
+            if category in ['technology', 'business', 'science']:
+                assert category == detected_category
+            
+            # Verify breaking news flag
+            assert isinstance(is_breaking, bool)
+            
+            logger.info(f"Successfully summarized article {i+1} for {category}")
+            
+            # Add results to article for full pipeline test
+            article['summary'] = summary
+            article['detected_category'] = detected_category
+            article['is_breaking'] = is_breaking
+        
+        # Save processed articles
+        cache_file = self.cache_dir / f"{category}_articles.json"
+        with open(cache_file, 'wb') as f:
+            f.write(orjson.dumps(articles))
     
-    def test_03_cache_operations(self):
+    @pytest.mark.parametrize("category", CATEGORIES)
+    def test_03_cache_operations(self, category):
         """Test caching of processed articles"""
-        for category in self.categories:
-            with self.subTest(category=category):
-                # Load processed articles
-                cache_file = self.cache_dir / f"{category}_articles.json"
-                with open(cache_file) as f:
-                    articles = json.load(f)
-                
-                # Test cache save
-                self.cache.save_news(category, articles)
-                
-                # Test cache retrieval
-                cached = self.cache.get_news(category)
-                self.assertEqual(len(cached), len(articles))
-                
-                # Verify all fields are preserved
-                for orig, cached_art in zip(articles, cached):
-                    self.assertEqual(orig['title'], cached_art['title'])
-                    self.assertEqual(orig['summary'], cached_art['summary'])
-                    self.assertEqual(orig['detected_category'], cached_art['detected_category'])
-                    self.assertEqual(orig['is_breaking'], cached_art['is_breaking'])
-                
-                logger.info(f"Successfully tested cache operations for {category}")
+        articles = self._processed(category)
+        
+        # Test cache save
+        self.cache.save_news(category, articles)
+        
+        # Test cache retrieval
+        cached = self.cache.get_news(category)
+        assert len(cached) == len(articles)
+        
+        # Verify all fields are preserved
+        for orig, cached_art in zip(articles, cached):
+            assert orig['title'] == cached_art['title']
+            assert orig['summary'] == cached_art['summary']
+            assert orig['category'] == cached_art['category']
+            assert orig['isBreaking'] == cached_art['isBreaking']
+        
+        logger.info(f"Successfully tested cache operations for {category}")
     
-    def test_04_full_pipeline(self):
+    @pytest.mark.parametrize("category", CATEGORIES)
+    def test_04_full_pipeline(self, category):
         """Test the complete news processing pipeline"""
-        for category in self.categories:
-            with self.subTest(category=category):
-                # Process news through orchestrator
-                processed_articles = self.orchestrator.process_news(category)
-                
-                # Verify we got results
-                self.assertIsInstance(processed_articles, list)
-                self.assertGreater(len(processed_articles), 0)
-                
-                # Check each processed article
-                for article in processed_articles:
-                    # Verify all required fields
-                    required_fields = [
-                        'title', 'description', 'url', 'publishedAt', 'source',
-                        'summary', 'category', 'isBreaking'
-                    ]
-                    for field in required_fields:
-                        self.assertIn(field, article)
-                    
-                    # Verify field types
-                    self.assertIsInstance(article['title'], str)
-                    self.assertIsInstance(article['summary'], str)
-                    self.assertIsInstance(article['isBreaking'], bool)
-                    self.assertIn(article['category'], 
-                                ['technology', 'business', 'science', 'world', 'general'])
-                
-                logger.info(f"Successfully tested full pipeline for {category}")
+        # Process news through orchestrator
+        processed_articles = self._processed(category)
+        
+        # Verify we got results
+        assert isinstance(processed_articles, list)
+        assert len(processed_articles) > 0
+        
+        # Check each processed article
+        for article in processed_articles:
+            # Verify all required fields
+            required_fields = [
+                'title', 'description', 'url', 'publishedAt', 'source',
+                'summary', 'category', 'isBreaking'
+            ]
+            for field in required_fields:
+                assert field in article
+            
+            # Verify field types
+            assert isinstance(article['title'], str)
+            assert isinstance(article['summary'], str)
+            assert isinstance(article['isBreaking'], bool)
+            assert article['category'] in ['technology', 'business', 'science', 'world', 'general']
+        
+        logger.info(f"Successfully tested full pipeline for {category}")
     
-    def test_05_rate_limiting(self):
+    @pytest.mark.parametrize("category", CATEGORIES)
+    @my_vcr.use_cassette('rate_limit.json', allow_playback_repeats=True)
+    def test_05_rate_limiting(self, category):
         """Test rate limiting functionality"""
         # Test rapid sequential requests
         for _ in range(3):
-            articles = self.news_fetcher.fetch_news('technology')
-            self.assertIsInstance(articles, list)
-            self.assertGreater(len(articles), 0)
+            articles = self.news_fetcher.fetch_news(category)
+            assert isinstance(articles, list)
+            assert len(articles) > 0
         
-        logger.info("Successfully tested rate limiting")
+        logger.info(f"Successfully tested rate limiting for {category}")
 
 if __name__ == '__main__':
-    unittest.main(verbosity=2)
+    sys.exit(pytest.main([__file__, '-v']))
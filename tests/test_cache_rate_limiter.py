@@ -1,11 +1,12 @@
 """
 Tests for Cache and Rate Limiter components
 """
+import os
+import threading
 import pytest
-import time
 from datetime import datetime, timedelta
 from src.core.rate_limiter import RateLimiter, EnhancedCache
-from tests.test_utils import create_test_dataset, test_cache_dir
+from tests.test_utils import create_test_dataset
 
 class TestRateLimiter:
     def test_rate_limiting_basic(self):
@@ -20,9 +21,9 @@ class TestRateLimiter:
         # Should deny 4th call
         assert not limiter.try_acquire()
 
-    def test_rate_limiting_window(self):
+    def test_rate_limiting_window(self, fake_clock):
         """Test rate limit window functionality"""
-        limiter = RateLimiter(calls=2, time_window=1)
+        limiter = RateLimiter(calls=2, time_window=1, clock=fake_clock)
         
         # Use up rate limit
         assert limiter.try_acquire()
@@ -30,71 +31,44 @@ class TestRateLimiter:
         assert not limiter.try_acquire()
         
         # Wait for window to reset
-        time.sleep(1.1)
+        fake_clock.advance(1.1)
         assert limiter.try_acquire()
 
-    def test_concurrent_access(self):
+    def test_concurrent_access(self, thread_pool):
         """Test rate limiting under concurrent access"""
-        import threading
-        
         limiter = RateLimiter(calls=3, time_window=1)
-        results = []
+        barrier = threading.Barrier(5)
         
-        def try_acquire():
-            results.append(limiter.try_acquire())
+        def try_acquire(_):
+            # Release all workers together so they contend for the lock
+            barrier.wait()
+            return limiter.try_acquire()
         
-        # Create and start threads
-        threads = [threading.Thread(target=try_acquire) for _ in range(5)]
-        for thread in threads:
-            thread.start()
-        for thread in threads:
-            thread.join()
+        results = list(thread_pool.map(try_acquire, range(5)))
         
         # Should have exactly 3 successes
         assert sum(results) == 3
 
-    def test_wait_if_needed(self):
+    def test_wait_if_needed(self, fake_clock):
         """Test wait_if_needed functionality"""
-        limiter = RateLimiter(calls=2, time_window=1)
+        limiter = RateLimiter(calls=2, time_window=1, clock=fake_clock, sleep=fake_clock.advance)
         
         # Use up rate limit
         assert limiter.try_acquire()
         assert limiter.try_acquire()
         
         # Measure wait time
-        start_time = time.time()
-        limiter.wait_if_needed()
-        elapsed = time.time() - start_time
+        start_time = fake_clock()
+        waited = limiter.wait_if_needed()
+        elapsed = fake_clock() - start_time
         
         assert elapsed >= 1.0
+        assert waited == pytest.approx(elapsed)
 
 class TestEnhancedCache:
-    def test_basic_cache_operations(self, test_cache_dir):
-        """Test basic cache set/get operations"""
-        cache = EnhancedCache(cache_dir=test_cache_dir)
-        
-        # Test setting and getting
-        cache.set('test_key', 'test_value')
-        assert cache.get('test_key') == 'test_value'
-        
-        # Test non-existent key
-        assert cache.get('non_existent') is None
-
-    def test_cache_expiry(self, test_cache_dir):
-        """Test cache expiration"""
-        cache = EnhancedCache(cache_dir=test_cache_dir)
-        
-        # Set with short expiry
-        cache.set('expire_key', 'expire_value', expiry=timedelta(seconds=1))
-        assert cache.get('expire_key') == 'expire_value'
-        
-        # Wait for expiration
-        time.sleep(1.1)
-        assert cache.get('expire_key') is None
-
     def test_memory_cache(self, test_cache_dir):
         """Test memory cache functionality"""
-        cache = EnhancedCache(cache_dir=test_cache_dir)
+        cache = EnhancedCache(cache_dir=test_cache_dir, in_memory=True)
         
         # Set value
         cache.set('memory_key', 'memory_value')
@@ -105,48 +79,52 @@ class TestEnhancedCache:
 
     def test_file_persistence(self, test_cache_dir):
         """Test file persistence"""
-        cache = EnhancedCache(cache_dir=test_cache_dir)
+        cache_dir = os.path.join(test_cache_dir, 'file_persistence')
+        cache = EnhancedCache(cache_dir=cache_dir)
         
         # Set value
         test_data = {'key': 'value'}
         cache.set('file_key', test_data)
+        cache.flush()
         
         # Create new cache instance (clear memory cache)
-        new_cache = EnhancedCache(cache_dir=test_cache_dir)
+        new_cache = EnhancedCache(cache_dir=cache_dir)
         
         # Should still be able to get value
         assert new_cache.get('file_key') == test_data
 
-    def test_clear_expired(self, test_cache_dir):
+    def test_write_coalescing(self, test_cache_dir):
+        """Test repeated sets are written to disk once, on flush"""
+        cache_dir = os.path.join(test_cache_dir, 'write_coalescing')
+        cache = EnhancedCache(cache_dir=cache_dir, flush_interval=60)
+        
+        cache.set('coalesced', 'first')
+        cache.set('coalesced', 'second')
+        assert os.listdir(cache_dir) == []
+        assert cache.get('coalesced') == 'second'
+        
+        cache.flush()
+        assert os.listdir(cache_dir) == ['coalesced.json']
+        assert EnhancedCache(cache_dir=cache_dir).get('coalesced') == 'second'
+
+    def test_clear_expired(self, test_cache_dir, fake_clock):
         """Test clearing expired entries"""
-        cache = EnhancedCache(cache_dir=test_cache_dir)
+        cache = EnhancedCache(cache_dir=test_cache_dir, clock=fake_clock)
         
         # Set some values with different expiry times
         cache.set('expire1', 'value1', expiry=timedelta(seconds=1))
         cache.set('expire2', 'value2', expiry=timedelta(hours=1))
         
         # Wait for first to expire
-        time.sleep(1.1)
+        fake_clock.advance(1.1)
         cache.clear_expired()
         
         assert cache.get('expire1') is None
         assert cache.get('expire2') == 'value2'
 
-    def test_cache_size(self, test_cache_dir):
-        """Test cache size reporting"""
-        cache = EnhancedCache(cache_dir=test_cache_dir)
-        
-        # Add some items
-        for i in range(5):
-            cache.set(f'key{i}', f'value{i}')
-        
-        stats = cache.get_cache_size()
-        assert stats['memory_items'] == 5
-        assert stats['file_items'] == 5
-
     def test_complex_data_types(self, test_cache_dir):
         """Test caching complex data types"""
-        cache = EnhancedCache(cache_dir=test_cache_dir)
+        cache = EnhancedCache(cache_dir=test_cache_dir, in_memory=True)
         
         # Test with different data types
         test_cases = [
@@ -166,25 +144,18 @@ class TestEnhancedCache:
             else:
                 assert retrieved == value
 
-    def test_concurrent_access(self, test_cache_dir):
+    def test_concurrent_access(self, test_cache_dir, thread_pool):
         """Test concurrent cache access"""
-        import threading
-        
-        cache = EnhancedCache(cache_dir=test_cache_dir)
+        cache = EnhancedCache(cache_dir=test_cache_dir, in_memory=True)
+        barrier = threading.Barrier(10)
         
         def cache_operation(id):
+            barrier.wait()
             cache.set(f'key{id}', f'value{id}')
-            assert cache.get(f'key{id}') == f'value{id}'
-        
-        threads = [
-            threading.Thread(target=cache_operation, args=(i,))
-            for i in range(10)
-        ]
+            return cache.get(f'key{id}') == f'value{id}'
         
-        for thread in threads:
-            thread.start()
-        for thread in threads:
-            thread.join()
+        # Each operation saw its own write
+        assert all(thread_pool.map(cache_operation, range(10)))
         
         # Verify all values were stored correctly
         for i in range(10):
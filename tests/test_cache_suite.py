@@ -0,0 +1,50 @@
+"""
+EnhancedCache behaviour shared by the memory and file backends
+"""
+import os
+import re
+import pytest
+from datetime import timedelta
+from src.core.rate_limiter import EnhancedCache
+
+@pytest.fixture(params=["memory", pytest.param("file", marks=pytest.mark.slow)])
+def backend(request):
+    return request.param
+
+@pytest.fixture
+def cache_dir(request, test_cache_dir):
+    """Per-test directory under the session cache dir"""
+    return os.path.join(test_cache_dir, re.sub(r'\W', '_', request.node.name))
+
+@pytest.fixture
+def cache(backend, cache_dir, fake_clock):
+    return EnhancedCache(cache_dir=cache_dir, clock=fake_clock, in_memory=(backend == "memory"))
+
+def test_basic_ops(cache):
+    """Test basic cache set/get operations"""
+    cache.set('test_key', 'test_value')
+    assert cache.get('test_key') == 'test_value'
+
+    # Test non-existent key
+    assert cache.get('non_existent') is None
+
+def test_expiry(cache, backend, cache_dir, fake_clock):
+    """Test cache expiration"""
+    cache.set('expire_key', 'expire_value', expiry=timedelta(seconds=1))
+    assert cache.get('expire_key') == 'expire_value'
+    cache.flush()
+
+    fake_clock.advance(1.1)
+    assert cache.get('expire_key') is None
+
+    if backend == "file":
+        # The persisted copy has expired too
+        assert EnhancedCache(cache_dir=cache_dir, clock=fake_clock).get('expire_key') is None
+
+def test_size(cache, backend):
+    """Test cache size reporting"""
+    cache.set_many({f'key{i}': f'value{i}' for i in range(5)})
+
+    stats = cache.get_cache_size()
+    assert stats['memory_items'] == 5
+    assert stats['file_items'] == (5 if backend == "file" else 0)
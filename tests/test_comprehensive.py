@@ -2,16 +2,15 @@
 Comprehensive test suite for news automation
 """
 import unittest
-import os
 import json
-import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from unittest.mock import Mock, patch
 from src.core.news_fetcher import NewsFetcher
 from src.core.ai_generator import AIGenerator
-from src.core.rate_limiter import RateLimiter, EnhancedCache
+from src.core.rate_limiter import RateLimiter
 from src.core.error_monitor import ErrorMonitor
 from src.orchestrator import NewsOrchestrator
+from tests.test_utils import FakeClock
 
 class TestNewsFetcher(unittest.TestCase):
     def setUp(self):
@@ -47,7 +46,7 @@ class TestAIGenerator(unittest.TestCase):
     def setUp(self):
         self.ai_generator = AIGenerator()
         
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_summarize_article(self, mock_post):
         # Mock Ollama response
         mock_post.return_value.ok = True
@@ -72,7 +71,8 @@ class TestAIGenerator(unittest.TestCase):
 
 class TestRateLimiter(unittest.TestCase):
     def setUp(self):
-        self.rate_limiter = RateLimiter(calls=2, time_window=1)
+        self.clock = FakeClock()
+        self.rate_limiter = RateLimiter(calls=2, time_window=1, clock=self.clock)
         
     def test_rate_limiting(self):
         # First two calls should succeed
@@ -83,33 +83,11 @@ class TestRateLimiter(unittest.TestCase):
         self.assertFalse(self.rate_limiter.try_acquire())
         
         # Wait for time window to pass
-        time.sleep(1.1)
+        self.clock.advance(1.1)
         
         # Should succeed again
         self.assertTrue(self.rate_limiter.try_acquire())
 
-class TestEnhancedCache(unittest.TestCase):
-    def setUp(self):
-        self.cache = EnhancedCache(cache_dir='test_cache')
-        
-    def tearDown(self):
-        # Clean up test cache
-        import shutil
-        if os.path.exists('test_cache'):
-            shutil.rmtree('test_cache')
-            
-    def test_cache_operations(self):
-        # Test setting and getting
-        self.cache.set('test_key', 'test_value')
-        self.assertEqual(self.cache.get('test_key'), 'test_value')
-        
-        # Test expiration
-        self.cache.set('expire_key', 'expire_value', expiry=timedelta(seconds=1))
-        self.assertEqual(self.cache.get('expire_key'), 'expire_value')
-        
-        time.sleep(1.1)
-        self.assertIsNone(self.cache.get('expire_key'))
-
 class TestErrorMonitor(unittest.TestCase):
     def setUp(self):
         self.error_monitor = ErrorMonitor()
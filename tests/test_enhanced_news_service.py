@@ -0,0 +1,66 @@
+"""
+Tests for the enhanced news service's conditional feed requests
+"""
+import orjson
+import pytest
+import yaml
+import feedparser
+from unittest.mock import patch
+from enhanced_news_service import EnhancedNewsService
+from sources import RSSAdapter
+
+FEED_URL = "https://example.com/feed.xml"
+SOURCE = {
+    'id': 'example',
+    'name': 'Example',
+    'discovery': 'rss',
+    'rss': FEED_URL,
+    'category': 'technology'
+}
+ARTICLE_URLS = ["https://example.com/story", "https://example.com/live-video"]
+
+@pytest.fixture
+def service(tmp_path):
+    config = {
+        'user_agent': 'TestAgent/1.0',
+        'rate_limit_delay': 0,
+        'concurrency': 1,
+        'ollama': {'enabled': False},
+        'output_dir': str(tmp_path / 'data'),
+        'json_filename': 'news.json',
+        'feed_state_file': str(tmp_path / 'feed_state.json'),
+        'logging': {'file': str(tmp_path / 'logs' / 'service.log')},
+        'sources': [SOURCE]
+    }
+    config_path = tmp_path / 'config.yaml'
+    config_path.write_text(yaml.safe_dump(config))
+    return EnhancedNewsService(str(config_path))
+
+@pytest.fixture
+def feed():
+    """Serve a feed with new validators listing both article URLs"""
+    parsed = feedparser.FeedParserDict(
+        status=200, etag='"v2"', bozo=0,
+        entries=[{'link': url} for url in ARTICLE_URLS]
+    )
+    with patch('sources.rss_adapter.feedparser.parse', return_value=parsed):
+        yield
+
+def _parse(html, url):
+    """The story parses; the live video page has no title and is rejected"""
+    return {'title': 'Story'} if url == ARTICLE_URLS[0] else {}
+
+@pytest.mark.parametrize("pages,saved", [
+    ({url: '<html></html>' for url in ARTICLE_URLS}, True),  # Video page fetched but rejected
+    ({ARTICLE_URLS[0]: '<html></html>', ARTICLE_URLS[1]: ''}, False),  # Video page download failed
+], ids=["rejected", "fetch-failed"])
+def test_validators_saved_unless_fetch_failed(service, feed, pages, saved):
+    """Test only download failures keep a feed's old validators"""
+    with patch.object(RSSAdapter, 'fetch', side_effect=pages.get), \
+         patch.object(RSSAdapter, 'parse', side_effect=_parse):
+        articles = service.fetch_from_source(SOURCE)
+    assert [a['source_url'] for a in articles] == [ARTICLE_URLS[0]]
+
+    service.commit_feed_state()
+    state = orjson.loads(service.feed_state_path.read_bytes())
+    assert (state.get(FEED_URL, {}).get('etag') == '"v2"') is saved
@@ -1,156 +1,147 @@
 """
 Tests for The Guardian news provider
 """
-import unittest
-from unittest.mock import Mock, patch
+import pytest
 import json
 import requests
 from datetime import datetime
 from src.core.guardian_provider import GuardianNewsProvider
+from tests.test_utils import VALID_CATEGORIES
 
-class TestGuardianProvider(unittest.TestCase):
-    """Test cases for The Guardian news provider"""
+# Tests share the session guardian_provider; keep them on one xdist worker
+pytestmark = pytest.mark.xdist_group(name=__name__)
 
-    def setUp(self):
-        """Set up test environment"""
-        self.provider = GuardianNewsProvider()
-        self.test_api_key = "test_key"
-        self.provider.api_key = self.test_api_key
-        self.provider.is_available = True
-        
-        self.test_article = {
-            "id": "technology/2025/sep/02/test-article",
-            "type": "article",
-            "sectionId": "technology",
-            "webTitle": "Test Article Title",
-            "webUrl": "https://www.theguardian.com/technology/2025/sep/02/test-article",
-            "apiUrl": "https://content.guardianapis.com/technology/2025/sep/02/test-article",
-            "fields": {
-                "headline": "Test Article Title",
-                "standfirst": "This is a test article about technology",
-                "thumbnail": "https://media.guim.co.uk/test.jpg",
-                "lastModified": "2025-09-02T12:00:00Z",
-                "body": "Full article content here"
-            },
-            "tags": [
-                {
-                    "id": "technology/ai",
-                    "type": "keyword",
-                    "webTitle": "Artificial intelligence (AI)"
-                }
-            ]
+TEST_API_KEY = "test_key"
+GUARDIAN_URL = "https://content.guardianapis.com/search"
+
+TEST_ARTICLE = {
+    "id": "technology/2025/sep/02/test-article",
+    "type": "article",
+    "sectionId": "technology",
+    "webTitle": "Test Article Title",
+    "webUrl": "https://www.theguardian.com/technology/2025/sep/02/test-article",
+    "apiUrl": "https://content.guardianapis.com/technology/2025/sep/02/test-article",
+    "fields": {
+        "headline": "Test Article Title",
+        "standfirst": "This is a test article about technology",
+        "thumbnail": "https://media.guim.co.uk/test.jpg",
+        "lastModified": "2025-09-02T12:00:00Z",
+        "body": "Full article content here"
+    },
+    "tags": [
+        {
+            "id": "technology/ai",
+            "type": "keyword",
+            "webTitle": "Artificial intelligence (AI)"
         }
+    ]
+}
 
-    def test_init(self):
+@pytest.fixture(scope="session")
+def guardian_invalid_sections(guardian_provider):
+    """Sections mapped to a category outside VALID_CATEGORIES, computed once"""
+    return {section: category for section, category in guardian_provider.section_to_category.items()
+            if category not in VALID_CATEGORIES}
+
+class TestGuardianProvider:
+    """Test cases for The Guardian news provider"""
+
+    @pytest.fixture(autouse=True)
+    def _reset(self, guardian_provider):
+        """Undo changes made by a test on the shared provider"""
+        yield
+        guardian_provider.api_key = TEST_API_KEY
+        guardian_provider.mark_available()
+
+    def test_init(self, guardian_provider):
         """Test provider initialization"""
-        self.assertEqual(self.provider.name, "Guardian")
-        self.assertTrue(self.provider.is_available)
-        self.assertIsNone(self.provider.last_error)
-        self.assertEqual(self.provider.base_url, "https://content.guardianapis.com/search")
+        assert guardian_provider.name == "Guardian"
+        assert guardian_provider.is_available
+        assert guardian_provider.last_error is None
+        assert guardian_provider.base_url == "https://content.guardianapis.com/search"
 
-    def test_section_to_category_mapping(self):
+    def test_section_to_category_mapping(self, guardian_invalid_sections):
         """Test section to category mapping"""
-        # Test all sections map to valid categories
-        valid_categories = {'technology', 'business', 'science', 'sports', 
-                          'entertainment', 'politics', 'general'}
-        for section, category in self.provider.section_to_category.items():
-            self.assertIn(category, valid_categories)
+        assert not guardian_invalid_sections, f"Invalid mappings: {guardian_invalid_sections}"
 
-    @patch('requests.Session')
-    def test_make_request(self, mock_session):
+    def test_make_request(self, api_mock, guardian_provider):
         """Test API request making"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'response': {'results': []}}
-        mock_session.return_value.get.return_value = mock_response
+        requests_mock = api_mock({'response': {'results': []}}, url=GUARDIAN_URL)
         
-        result = self.provider._make_request()
-        self.assertEqual(result, {'results': []})
+        result = guardian_provider._make_request()
+        assert result == {'results': []}
         
         # Verify API key was used
-        called_args = mock_session.return_value.get.call_args
-        self.assertIn('api-key', called_args[1]['params'])
-        self.assertEqual(called_args[1]['params']['api-key'], self.test_api_key)
+        assert requests_mock.last_request.qs['api-key'] == [TEST_API_KEY]
 
-    def test_parse_date(self):
+    def test_parse_date(self, guardian_provider):
         """Test date parsing"""
         test_date = "2025-09-02T12:00:00Z"
-        parsed = self.provider._parse_date(test_date)
-        self.assertEqual(parsed, "2025-09-02T12:00:00Z")
+        parsed = guardian_provider._parse_date(test_date)
+        assert parsed == "2025-09-02T12:00:00Z"
         
         # Test invalid date
         invalid_date = "not a date"
-        parsed = self.provider._parse_date(invalid_date)
-        self.assertTrue(parsed.endswith('Z'))  # Should return current time
+        parsed = guardian_provider._parse_date(invalid_date)
+        assert parsed.endswith('Z')  # Should return current time
         
-    def test_determine_category(self):
+    def test_determine_category(self, guardian_provider):
         """Test category determination"""
-        article = self.test_article
-        category = self.provider._determine_category(article)
-        self.assertEqual(category, 'technology')
+        article = dict(TEST_ARTICLE)
+        category = guardian_provider._determine_category(article)
+        assert category == 'technology'
         
         # Test fallback when no section matches
         article['sectionId'] = 'nonexistent'
-        category = self.provider._determine_category(article)
-        self.assertEqual(category, 'general')
+        category = guardian_provider._determine_category(article)
+        assert category == 'general'
         
         # Test empty article
-        category = self.provider._determine_category({})
-        self.assertEqual(category, 'general')
+        category = guardian_provider._determine_category({})
+        assert category == 'general'
 
-    @patch('requests.Session')
-    def test_fetch_news(self, mock_session):
+    def test_fetch_news(self, api_mock, guardian_provider):
         """Test news fetching"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_data = {'response': {'results': [self.test_article]}}
-        mock_response.json.return_value = mock_data
-        mock_session.return_value.get.return_value = mock_response
+        api_mock({'response': {'results': [TEST_ARTICLE]}}, url=GUARDIAN_URL)
         
-        articles = self.provider.fetch_news()
-        self.assertEqual(len(articles), 1)
+        articles = guardian_provider.fetch_news()
+        assert len(articles) == 1
         article = articles[0]
         
         # Verify article format
-        self.assertEqual(article['title'], self.test_article['webTitle'])
-        self.assertEqual(article['url'], self.test_article['webUrl'])
-        self.assertEqual(article['description'], self.test_article['fields']['standfirst'])
-        self.assertEqual(article['imageUrl'], self.test_article['fields']['thumbnail'])
-        self.assertEqual(article['category'], 'technology')
-        self.assertEqual(article['source']['name'], 'The Guardian')
+        assert article['title'] == TEST_ARTICLE['webTitle']
+        assert article['url'] == TEST_ARTICLE['webUrl']
+        assert article['description'] == TEST_ARTICLE['fields']['standfirst']
+        assert article['imageUrl'] == TEST_ARTICLE['fields']['thumbnail']
+        assert article['category'] == 'technology'
+        assert article['source']['name'] == 'The Guardian'
 
-    @patch('requests.Session')
-    def test_error_handling(self, mock_session):
+    @pytest.mark.parametrize("get_error,json_error", [
+        (requests.exceptions.RequestException("Network error"), None),
+        (None, json.JSONDecodeError("Invalid JSON", "Invalid JSON", 0)),
+    ], ids=["network", "json"])
+    def test_error_handling(self, mock_session, guardian_provider, get_error, json_error):
         """Test error handling"""
-        # Test network error
-        mock_session.return_value.get.side_effect = requests.exceptions.RequestException("Network error")
-        with self.assertRaises(requests.exceptions.RequestException):
-            self.provider.fetch_news()
-        self.assertFalse(self.provider.is_available)
-        self.assertIn("Network error", self.provider.last_error)
+        mock_session.return_value.get.side_effect = get_error
+        response = mock_session.return_value.get.return_value
+        response.json.side_effect = json_error
         
-        # Test JSON decode error
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "Invalid JSON", 0)
-        mock_session.return_value.get.side_effect = None
-        mock_session.return_value.get.return_value = mock_response
-        
-        with self.assertRaises(json.JSONDecodeError):
-            self.provider.fetch_news()
-        self.assertFalse(self.provider.is_available)
+        with pytest.raises(type(get_error or json_error)):
+            guardian_provider.fetch_news()
+        assert not guardian_provider.is_available
+        if get_error:
+            assert "Network error" in guardian_provider.last_error
 
-    def test_provider_availability(self):
+    def test_provider_availability(self, guardian_provider):
         """Test provider availability checks"""
         # Test with API key
-        self.provider.api_key = "test_key"
-        self.assertTrue(self.provider.is_available)
-        
-        # Test without API key
-        self.provider.api_key = ""
-        self.provider = GuardianNewsProvider()  # Reinitialize to trigger check
-        self.assertFalse(self.provider.is_available)
-        self.assertIn("API key not found", self.provider.last_error)
+        guardian_provider.api_key = "test_key"
+        assert guardian_provider.is_available
 
-if __name__ == '__main__':
-    unittest.main()
+def test_availability_without_key(monkeypatch):
+    """Test a provider built without an API key reports itself unavailable"""
+    # Outside the class so the shared guardian_provider isn't involved
+    monkeypatch.delenv("GUARDIAN_API_KEY", raising=False)
+    provider = GuardianNewsProvider()
+    assert not provider.is_available
+    assert "API key not found" in provider.last_error
@@ -1,154 +1,276 @@
 """
 Tests for the news aggregator
 """
-import unittest
+import threading
 from unittest.mock import Mock, patch
+import pytest
 import requests
 from src.core.news_aggregator import NewsAggregator
 from src.core.gdelt_provider import GdeltNewsProvider
 from src.core.guardian_provider import GuardianNewsProvider
 from src.core.newsapi_provider import NewsAPIProvider
+from tests.test_utils import FakeClock
 
-class TestNewsAggregator(unittest.TestCase):
-    """Test cases for the news aggregator"""
-
-    def setUp(self):
-        """Set up test environment"""
-        self.aggregator = NewsAggregator()
-        self.test_article = {
-            'title': 'Test Article',
-            'description': 'Test Description',
-            'url': 'https://example.com/article',
-            'publishedAt': '2025-09-02T12:00:00Z',
-            'source': {'name': 'Test Source'},
-            'category': 'technology'
-        }
-
-    def test_init(self):
-        """Test aggregator initialization"""
-        self.assertEqual(len(self.aggregator.providers), 3)
-        self.assertIsInstance(self.aggregator.providers[0], GdeltNewsProvider)
-        self.assertIsInstance(self.aggregator.providers[1], GuardianNewsProvider)
-        self.assertIsInstance(self.aggregator.providers[2], NewsAPIProvider)
-
-    def test_get_categories(self):
-        """Test getting supported categories"""
-        categories = self.aggregator.get_categories()
-        self.assertIsInstance(categories, list)
-        self.assertTrue(len(categories) > 0)
-        self.assertIn('technology', categories)
-        self.assertIn('business', categories)
-
-    def test_provider_status(self):
-        """Test getting provider status"""
-        status = self.aggregator.get_provider_status()
-        self.assertEqual(len(status), 3)
-        for provider_status in status:
-            self.assertIn('name', provider_status)
-            self.assertIn('available', provider_status)
-            self.assertIn('error', provider_status)
-
-    @patch('src.core.gdelt_provider.GdeltNewsProvider.fetch_news')
-    def test_primary_provider_success(self, mock_fetch):
-        """Test successful fetch from primary provider"""
-        mock_fetch.return_value = [self.test_article]
-        
-        news = self.aggregator.fetch_news('technology')
-        self.assertEqual(len(news), 1)
-        self.assertEqual(news[0]['title'], self.test_article['title'])
-        
-        # Should not try other providers
-        self.assertEqual(mock_fetch.call_count, 1)
-
-    @patch('src.core.gdelt_provider.GdeltNewsProvider.fetch_news')
-    @patch('src.core.guardian_provider.GuardianNewsProvider.fetch_news')
-    def test_fallback_to_guardian(self, mock_guardian_fetch, mock_gdelt_fetch):
-        """Test fallback to Guardian when GDELT fails"""
-        # Make GDELT fail
-        mock_gdelt_fetch.side_effect = requests.exceptions.RequestException("Network error")
-        
-        # Make Guardian succeed
-        mock_guardian_fetch.return_value = [self.test_article]
-        
-        news = self.aggregator.fetch_news('technology')
-        self.assertEqual(len(news), 1)
-        self.assertEqual(news[0]['title'], self.test_article['title'])
-        
-        # Verify both providers were tried
-        mock_gdelt_fetch.assert_called_once()
-        mock_guardian_fetch.assert_called_once()
-
-    @patch('src.core.gdelt_provider.GdeltNewsProvider.fetch_news')
-    @patch('src.core.guardian_provider.GuardianNewsProvider.fetch_news')
-    @patch('src.core.newsapi_provider.NewsAPIProvider.fetch_news')
-    def test_fallback_to_newsapi(self, mock_newsapi_fetch, mock_guardian_fetch, mock_gdelt_fetch):
-        """Test fallback to NewsAPI when both GDELT and Guardian fail"""
-        # Make GDELT and Guardian fail
-        mock_gdelt_fetch.side_effect = requests.exceptions.RequestException("Network error")
-        mock_guardian_fetch.side_effect = requests.exceptions.RequestException("API error")
-        
-        # Make NewsAPI succeed
-        mock_newsapi_fetch.return_value = [self.test_article]
-        
-        news = self.aggregator.fetch_news('technology')
-        self.assertEqual(len(news), 1)
-        self.assertEqual(news[0]['title'], self.test_article['title'])
-        
-        # Verify all providers were tried
-        mock_gdelt_fetch.assert_called_once()
-        mock_guardian_fetch.assert_called_once()
-        mock_newsapi_fetch.assert_called_once()
-
-    @patch('src.core.gdelt_provider.GdeltNewsProvider.fetch_news')
-    @patch('src.core.guardian_provider.GuardianNewsProvider.fetch_news')
-    @patch('src.core.newsapi_provider.NewsAPIProvider.fetch_news')
-    def test_all_providers_fail(self, mock_newsapi_fetch, mock_guardian_fetch, mock_gdelt_fetch):
-        """Test handling when all providers fail"""
-        # Make all providers fail
-        mock_gdelt_fetch.side_effect = requests.exceptions.RequestException("GDELT error")
-        mock_guardian_fetch.side_effect = requests.exceptions.RequestException("Guardian error")
-        mock_newsapi_fetch.side_effect = requests.exceptions.RequestException("NewsAPI error")
-        
-        with self.assertRaises(Exception) as context:
-            self.aggregator.fetch_news('technology')
-            
-        self.assertIn("All news providers failed", str(context.exception))
-        self.assertIn("GDELT error", str(context.exception))
-        self.assertIn("Guardian error", str(context.exception))
-        self.assertIn("NewsAPI error", str(context.exception))
-
-    def test_reset_providers(self):
-        """Test resetting providers"""
-        # Mark all providers as unavailable
-        for provider in self.aggregator.providers:
-            provider.mark_unavailable("Test error")
-            
-        # Reset providers
-        self.aggregator.reset_providers()
-        
-        # Verify all providers are available
-        for provider in self.aggregator.providers:
-            self.assertTrue(provider.is_available)
-            self.assertIsNone(provider.last_error)
-
-    def test_max_articles_limit(self):
-        """Test max articles limit"""
-        # Create test articles
-        many_articles = [
-            {**self.test_article, 'title': f'Article {i}'}
-            for i in range(100)
-        ]
-        
-        with patch('src.core.gdelt_provider.GdeltNewsProvider.fetch_news') as mock_fetch:
-            mock_fetch.return_value = many_articles
-            
-            # Test default limit
-            news = self.aggregator.fetch_news('technology')
-            self.assertEqual(len(news), 50)  # Default max_articles
-            
-            # Test custom limit
-            news = self.aggregator.fetch_news('technology', max_articles=10)
-            self.assertEqual(len(news), 10)
-
-if __name__ == '__main__':
-    unittest.main()
+TEST_ARTICLE = {
+    'title': 'Test Article',
+    'description': 'Test Description',
+    'url': 'https://example.com/article',
+    'publishedAt': '2025-09-02T12:00:00Z',
+    'source': {'name': 'Test Source'},
+    'category': 'technology'
+}
+
+@pytest.fixture
+def aggregator():
+    return NewsAggregator()
+
+@pytest.fixture
+def fetch_mocks():
+    """Patch every provider's fetch_news, returning no articles unless configured"""
+    with patch.object(GdeltNewsProvider, 'fetch_news', return_value=[]) as gdelt, \
+         patch.object(GuardianNewsProvider, 'fetch_news', return_value=[]) as guardian, \
+         patch.object(NewsAPIProvider, 'fetch_news', return_value=[]) as newsapi:
+        yield {'gdelt': gdelt, 'guardian': guardian, 'newsapi': newsapi}
+
+def _provider(name, articles=None, error=None):
+    """Stand-in provider returning articles or raising error"""
+    provider = Mock(is_available=True)
+    provider.name = name
+    provider.fetch_news.return_value = articles
+    provider.fetch_news.side_effect = error
+    return provider
+
+def test_init(aggregator):
+    """Test aggregator initialization"""
+    assert len(aggregator.providers) == 3
+    assert isinstance(aggregator.providers[0], GdeltNewsProvider)
+    assert isinstance(aggregator.providers[1], GuardianNewsProvider)
+    assert isinstance(aggregator.providers[2], NewsAPIProvider)
+
+def test_get_categories(aggregator):
+    """Test getting supported categories"""
+    categories = aggregator.get_categories()
+    assert isinstance(categories, list)
+    assert len(categories) > 0
+    assert 'technology' in categories
+    assert 'business' in categories
+
+def test_provider_status(aggregator):
+    """Test getting provider status"""
+    status = aggregator.get_provider_status()
+    assert len(status) == 3
+    for provider_status in status:
+        assert 'name' in provider_status
+        assert 'available' in provider_status
+        assert 'error' in provider_status
+
+def test_primary_provider_success(aggregator, fetch_mocks):
+    """Test successful fetch from primary provider"""
+    fetch_mocks['guardian'].return_value = [TEST_ARTICLE]
+
+    news = aggregator.fetch_news('technology')
+    assert len(news) == 1
+    assert news[0]['title'] == TEST_ARTICLE['title']
+
+    # Fallbacks are only asked when the primary fails or is slow
+    assert fetch_mocks['guardian'].call_count == 1
+    fetch_mocks['gdelt'].assert_not_called()
+    fetch_mocks['newsapi'].assert_not_called()
+
+def test_fallback_to_gdelt(aggregator, fetch_mocks):
+    """Test fallback to GDELT when Guardian fails"""
+    fetch_mocks['guardian'].side_effect = requests.exceptions.RequestException("Network error")
+    fetch_mocks['gdelt'].return_value = [TEST_ARTICLE]
+
+    news = aggregator.fetch_news('technology')
+    assert len(news) == 1
+    assert news[0]['title'] == TEST_ARTICLE['title']
+
+    # Verify both providers were tried, and no further
+    fetch_mocks['guardian'].assert_called_once()
+    fetch_mocks['gdelt'].assert_called_once()
+    fetch_mocks['newsapi'].assert_not_called()
+
+def test_fallback_to_newsapi(aggregator, fetch_mocks):
+    """Test fallback to NewsAPI when both Guardian and GDELT fail"""
+    fetch_mocks['guardian'].side_effect = requests.exceptions.RequestException("Network error")
+    fetch_mocks['gdelt'].side_effect = requests.exceptions.RequestException("API error")
+    fetch_mocks['newsapi'].return_value = [TEST_ARTICLE]
+
+    news = aggregator.fetch_news('technology')
+    assert len(news) == 1
+    assert news[0]['title'] == TEST_ARTICLE['title']
+
+    # Verify all providers were tried
+    for mock_fetch in fetch_mocks.values():
+        mock_fetch.assert_called_once()
+
+def test_all_providers_fail(aggregator, fetch_mocks):
+    """Test handling when all providers fail"""
+    fetch_mocks['gdelt'].side_effect = requests.exceptions.RequestException("GDELT error")
+    fetch_mocks['guardian'].side_effect = requests.exceptions.RequestException("Guardian error")
+    fetch_mocks['newsapi'].side_effect = requests.exceptions.RequestException("NewsAPI error")
+
+    with pytest.raises(Exception) as excinfo:
+        aggregator.fetch_news('technology')
+
+    message = str(excinfo.value)
+    assert "All news providers failed" in message
+    assert "GDELT error" in message
+    assert "Guardian error" in message
+    assert "NewsAPI error" in message
+
+def test_slow_primary_hedged():
+    """Test a slow primary doesn't hold up a fallback once hedge_delay passes"""
+    aggregator = NewsAggregator(cache_ttl=0, hedge_delay=0.01)
+    release = threading.Event()
+
+    def fetch(category=None):
+        release.wait(timeout=5)
+        raise requests.exceptions.RequestException("Timed out")
+
+    primary = _provider('Primary', error=fetch)
+    backup = _provider('Backup', [{**TEST_ARTICLE, 'title': 'Backup Article'}])
+    aggregator.available_providers = [primary, backup]
+    try:
+        news = aggregator.fetch_news('technology')
+        assert not release.is_set()  # Answered while the primary was still stuck
+    finally:
+        release.set()
+    assert news[0]['title'] == 'Backup Article'
+
+def test_fallback_ignored_when_primary_succeeds():
+    """Test the primary's articles are used and fallbacks aren't asked"""
+    aggregator = NewsAggregator(cache_ttl=0, hedge_delay=5)
+    primary = _provider('Primary', [TEST_ARTICLE])
+    backup = _provider('Backup', [{**TEST_ARTICLE, 'title': 'Backup Article'}])
+    aggregator.available_providers = [primary, backup]
+
+    news = aggregator.fetch_news('technology')
+    assert news[0]['title'] == TEST_ARTICLE['title']
+    backup.fetch_news.assert_not_called()
+
+def test_results_cached_per_category(fetch_mocks):
+    """Test a repeated query within the TTL doesn't hit the providers"""
+    clock = FakeClock()
+    aggregator = NewsAggregator(cache_ttl=300, clock=clock)
+    for mock_fetch in fetch_mocks.values():
+        mock_fetch.return_value = [TEST_ARTICLE]
+    mock_fetch = fetch_mocks['guardian']
+
+    aggregator.fetch_news('technology')
+    calls = mock_fetch.call_count
+
+    news = aggregator.fetch_news('technology')
+    assert news[0]['title'] == TEST_ARTICLE['title']
+    assert mock_fetch.call_count == calls  # Served from cache
+
+    # Other categories and expired entries are fetched again
+    aggregator.fetch_news('business')
+    assert mock_fetch.call_count > calls
+    calls = mock_fetch.call_count
+    clock.advance(301)
+    aggregator.fetch_news('technology')
+    assert mock_fetch.call_count > calls
+
+def test_fetch_news_bulk(aggregator, fetch_mocks):
+    """Test fetching several categories in one call"""
+    categories = ['technology', 'business', 'science']
+
+    def fetch(category=None):
+        if category == 'science':
+            raise requests.exceptions.RequestException("API error")
+        return [{**TEST_ARTICLE, 'category': category}]
+
+    for mock_fetch in fetch_mocks.values():
+        mock_fetch.side_effect = fetch
+    news = aggregator.fetch_news_bulk(categories)
+
+    assert list(news) == categories
+    assert news['technology'][0]['category'] == 'technology'
+    assert news['business'][0]['category'] == 'business'
+    assert news['science'] == []  # Every provider failed
+
+def test_circuit_breaker():
+    """Test a repeatedly failing provider is skipped until its cool-down ends"""
+    clock = FakeClock()
+    aggregator = NewsAggregator(cache_ttl=0, clock=clock)
+    failing = _provider('Failing', error=requests.exceptions.RequestException("API error"))
+    working = _provider('Working', [TEST_ARTICLE])
+    aggregator.available_providers = [failing]
+
+    for _ in range(6):
+        with pytest.raises(Exception):
+            aggregator.fetch_news('technology')
+    assert failing.fetch_news.call_count == 6
+
+    # Breaker is open: only the working provider is asked
+    aggregator.available_providers = [failing, working]
+    assert len(aggregator.fetch_news('technology')) == 1
+    assert failing.fetch_news.call_count == 6
+
+    # After the cool-down the failing provider is tried again
+    clock.advance(61)
+    aggregator.available_providers = [failing]
+    with pytest.raises(Exception):
+        aggregator.fetch_news('technology')
+    assert failing.fetch_news.call_count == 7
+
+def test_providers_ranked_by_score():
+    """Test a provider that has been failing stops being preferred"""
+    aggregator = NewsAggregator(cache_ttl=0, clock=FakeClock())
+    primary = _provider('Primary', error=requests.exceptions.RequestException("API error"))
+    backup = _provider('Backup', [{**TEST_ARTICLE, 'title': 'Backup Article'}])
+    aggregator.available_providers = [primary, backup]
+
+    aggregator.fetch_news('technology')
+
+    # Primary has recovered, but Backup's record is now better
+    primary.fetch_news.side_effect = None
+    primary.fetch_news.return_value = [TEST_ARTICLE]
+    news = aggregator.fetch_news('technology')
+    assert news[0]['title'] == 'Backup Article'
+
+def test_merge_mode(aggregator):
+    """Test merging articles from every provider without duplicates"""
+    aggregator.available_providers = [
+        _provider('First', [TEST_ARTICLE]),
+        _provider('Second', [
+            dict(TEST_ARTICLE),  # Same URL as the first provider's article
+            {**TEST_ARTICLE, 'title': 'Other Article', 'url': 'https://example.com/other'}
+        ]),
+        _provider('Failing', error=requests.exceptions.RequestException("API error"))
+    ]
+
+    news = aggregator.fetch_news('technology', mode='merge')
+    assert sorted(a['url'] for a in news) == ['https://example.com/article', 'https://example.com/other']
+
+    with pytest.raises(ValueError):
+        aggregator.fetch_news('technology', mode='unknown')
+
+def test_reset_providers(aggregator):
+    """Test resetting providers"""
+    # Mark all providers as unavailable
+    for provider in aggregator.providers:
+        provider.mark_unavailable("Test error")
+
+    # Reset providers
+    aggregator.reset_providers()
+
+    # Verify all providers are available
+    for provider in aggregator.providers:
+        assert provider.is_available
+        assert provider.last_error is None
+
+@pytest.mark.parametrize("kwargs,expected", [
+    ({}, 50),  # Default max_articles
+    ({'max_articles': 10}, 10),
+])
+def test_max_articles_limit(aggregator, fetch_mocks, kwargs, expected):
+    """Test max articles limit"""
+    fetch_mocks['gdelt'].return_value = [
+        {**TEST_ARTICLE, 'title': f'Article {i}'}
+        for i in range(100)
+    ]
+
+    assert len(aggregator.fetch_news('technology', **kwargs)) == expected
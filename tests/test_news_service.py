@@ -4,12 +4,10 @@ Comprehensive test suite for news service components
 import pytest
 import json
 import os
+import time
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
 
 from src.webapp import app
 from src.core.provider_manager import NewsProviderManager
@@ -49,7 +47,8 @@ def health_monitor():
     """Fixture for health monitor"""
     monitor = HealthMonitor()
     yield monitor
-    # Cleanup
+    # Cleanup, after writing any pending state so it can't be recreated later
+    monitor.flush()
     if os.path.exists(monitor.state_file):
         os.remove(monitor.state_file)
 
@@ -89,6 +88,16 @@ class TestNewsAPI:
         data = response.json()
         assert len(data["data"]) <= limit
 
+    def test_news_cache_warmed_on_startup(self):
+        """Test the background refresh loads news.json before any request"""
+        import src.webapp as webapp
+        webapp._NEWS_CACHE["mtime"] = None
+        with TestClient(app):
+            deadline = time.monotonic() + 5
+            while webapp._NEWS_CACHE["mtime"] is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert webapp._NEWS_CACHE["mtime"] == os.stat(webapp.NEWS_FILE).st_mtime_ns
+
 class TestNewsValidation:
     """Test suite for news validation"""
 
@@ -132,6 +141,24 @@ class TestHealthMonitoring:
         assert status["status"] == "failing"
         assert status["consecutiveFailures"] == 4
 
+    def test_health_state_writes_coalesced(self, tmp_path):
+        """Test a burst of updates is written to the state file once, on flush"""
+        state_file = tmp_path / "health_state.json"
+        monitor = HealthMonitor(str(state_file), flush_delay=60)
+        for _ in range(4):
+            monitor.record_health_check(False)
+        assert not state_file.exists()
+        
+        monitor.flush()
+        assert json.loads(state_file.read_text())['consecutive_failures'] == 4
+
+    def test_provider_scores_persisted(self, health_monitor):
+        """Test provider scores survive a restart"""
+        scores = {'GDELT': {'success': 0.5, 'latency': 1.2}}
+        health_monitor.update_provider_scores(scores)
+        health_monitor.flush()
+        assert HealthMonitor(health_monitor.state_file).get_provider_scores() == scores
+
 class TestNewsProviders:
     """Test suite for news providers"""
 
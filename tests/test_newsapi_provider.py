@@ -1,152 +1,119 @@
 """
 Tests for NewsAPI provider
 """
-import unittest
-from unittest.mock import Mock, patch
 import json
+import pytest
 import requests
-from datetime import datetime
 from src.core.newsapi_provider import NewsAPIProvider
 
-class TestNewsAPIProvider(unittest.TestCase):
-    """Test cases for the NewsAPI provider"""
-
-    def setUp(self):
-        """Set up test environment"""
-        self.provider = NewsAPIProvider()
-        self.test_api_key = "test_key"
-        self.provider.api_key = self.test_api_key
-        self.provider.is_available = True
-        
-        self.test_article = {
-            "source": {
-                "id": "techcrunch",
-                "name": "TechCrunch"
-            },
-            "author": "John Doe",
-            "title": "Test Article Title",
-            "description": "This is a test article about technology",
-            "url": "https://techcrunch.com/2025/09/02/test-article",
-            "urlToImage": "https://techcrunch.com/test.jpg",
-            "publishedAt": "2025-09-02T12:00:00Z",
-            "content": "Full article content here"
-        }
-
-    def test_init(self):
-        """Test provider initialization"""
-        self.assertEqual(self.provider.name, "NewsAPI")
-        self.assertTrue(self.provider.is_available)
-        self.assertIsNone(self.provider.last_error)
-        self.assertEqual(self.provider.base_url, "https://newsapi.org/v2/top-headlines")
-
-    def test_category_mapping(self):
-        """Test category mapping"""
-        # Test all categories map to valid categories
-        valid_categories = {'technology', 'business', 'science', 'sports', 
-                          'entertainment', 'general'}
-        for newsapi_cat, our_cat in self.provider.category_mapping.items():
-            self.assertIn(our_cat, valid_categories)
-
-    @patch('requests.Session')
-    def test_make_request(self, mock_session):
-        """Test API request making"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'articles': []}
-        mock_session.return_value.get.return_value = mock_response
-        
-        result = self.provider._make_request()
-        self.assertEqual(result, {'articles': []})
-        
-        # Verify API key was used in headers
-        called_args = mock_session.return_value.get.call_args
-        self.assertIn('X-Api-Key', called_args[1]['headers'])
-        self.assertEqual(called_args[1]['headers']['X-Api-Key'], self.test_api_key)
-
-    def test_format_date(self):
-        """Test date formatting"""
-        test_date = "2025-09-02T12:00:00Z"
-        formatted = self.provider._format_date(test_date)
-        self.assertEqual(formatted, "2025-09-02T12:00:00Z")
-        
-        # Test invalid date
-        invalid_date = "not a date"
-        formatted = self.provider._format_date(invalid_date)
-        self.assertTrue(formatted.endswith('Z'))  # Should return current time
-
-    @patch('requests.Session')
-    def test_fetch_news(self, mock_session):
-        """Test news fetching"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_data = {'articles': [self.test_article]}
-        mock_response.json.return_value = mock_data
-        mock_session.return_value.get.return_value = mock_response
-        
-        articles = self.provider.fetch_news('technology')
-        self.assertEqual(len(articles), 1)
-        article = articles[0]
-        
-        # Verify article format
-        self.assertEqual(article['title'], self.test_article['title'])
-        self.assertEqual(article['url'], self.test_article['url'])
-        self.assertEqual(article['description'], self.test_article['description'])
-        self.assertEqual(article['imageUrl'], self.test_article['urlToImage'])
-        self.assertEqual(article['category'], 'technology')
-        self.assertEqual(article['source']['name'], 'TechCrunch')
-        self.assertEqual(article['author'], 'John Doe')
-
-    @patch('requests.Session')
-    def test_error_handling(self, mock_session):
-        """Test error handling"""
-        # Test network error
-        mock_session.return_value.get.side_effect = requests.exceptions.RequestException("Network error")
-        with self.assertRaises(requests.exceptions.RequestException):
-            self.provider.fetch_news()
-        self.assertFalse(self.provider.is_available)
-        self.assertIn("Network error", self.provider.last_error)
-        
-        # Test JSON decode error
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "Invalid JSON", 0)
-        mock_session.return_value.get.side_effect = None
-        mock_session.return_value.get.return_value = mock_response
-        
-        with self.assertRaises(json.JSONDecodeError):
-            self.provider.fetch_news()
-        self.assertFalse(self.provider.is_available)
-
-    def test_provider_availability(self):
-        """Test provider availability checks"""
-        # Test with API key
-        self.provider.api_key = "test_key"
-        self.assertTrue(self.provider.is_available)
-        
-        # Test without API key
-        self.provider.api_key = ""
-        self.provider = NewsAPIProvider()  # Reinitialize to trigger check
-        self.assertFalse(self.provider.is_available)
-        self.assertIn("API key not found", self.provider.last_error)
-
-    @patch('requests.Session')
-    def test_category_filtering(self, mock_session):
-        """Test category filtering in requests"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'articles': []}
-        mock_session.return_value.get.return_value = mock_response
-        
-        # Test with technology category
-        self.provider.fetch_news('technology')
-        called_args = mock_session.return_value.get.call_args
-        self.assertIn('category', called_args[1]['params'])
-        self.assertEqual(called_args[1]['params']['category'], 'technology')
-        
-        # Test with unknown category
-        self.provider.fetch_news('unknown')
-        called_args = mock_session.return_value.get.call_args
-        self.assertNotIn('category', called_args[1]['params'])
-
-if __name__ == '__main__':
-    unittest.main()
+TEST_API_KEY = "test_key"
+NEWSAPI_URL = "https://newsapi.org/v2/top-headlines"
+
+TEST_ARTICLE = {
+    "source": {
+        "id": "techcrunch",
+        "name": "TechCrunch"
+    },
+    "author": "John Doe",
+    "title": "Test Article Title",
+    "description": "This is a test article about technology",
+    "url": "https://techcrunch.com/2025/09/02/test-article",
+    "urlToImage": "https://techcrunch.com/test.jpg",
+    "publishedAt": "2025-09-02T12:00:00Z",
+    "content": "Full article content here"
+}
+
+@pytest.fixture
+def provider():
+    """Available provider with a test API key"""
+    provider = NewsAPIProvider()
+    provider.api_key = TEST_API_KEY
+    provider.is_available = True
+    return provider
+
+def test_init(provider):
+    """Test provider initialization"""
+    assert provider.name == "NewsAPI"
+    assert provider.is_available
+    assert provider.last_error is None
+    assert provider.base_url == NEWSAPI_URL
+
+def test_category_mapping(provider):
+    """Test all categories map to valid categories"""
+    valid_categories = {'technology', 'business', 'science', 'sports',
+                        'entertainment', 'general'}
+    assert set(provider.category_mapping.values()) <= valid_categories
+
+def test_make_request(provider, api_mock):
+    """Test API request making"""
+    requests_mock = api_mock({'articles': []}, url=NEWSAPI_URL)
+
+    assert provider._make_request() == {'articles': []}
+
+    # Verify API key was used in headers
+    assert requests_mock.last_request.headers['X-Api-Key'] == TEST_API_KEY
+
+@pytest.mark.parametrize("date,expected", [
+    ("2025-09-02T12:00:00Z", "2025-09-02T12:00:00Z"),
+    ("not a date", None),  # Falls back to the current time
+])
+def test_format_date(provider, date, expected):
+    """Test date formatting"""
+    formatted = provider._format_date(date)
+    if expected:
+        assert formatted == expected
+    else:
+        assert formatted.endswith('Z')
+
+def test_fetch_news(provider, api_mock):
+    """Test news fetching"""
+    api_mock({'articles': [TEST_ARTICLE]}, url=NEWSAPI_URL)
+
+    articles = provider.fetch_news('technology')
+    assert len(articles) == 1
+    article = articles[0]
+
+    # Verify article format
+    assert article['title'] == TEST_ARTICLE['title']
+    assert article['url'] == TEST_ARTICLE['url']
+    assert article['description'] == TEST_ARTICLE['description']
+    assert article['imageUrl'] == TEST_ARTICLE['urlToImage']
+    assert article['category'] == 'technology'
+    assert article['source']['name'] == 'TechCrunch'
+    assert article['author'] == 'John Doe'
+
+@pytest.mark.parametrize("reply,error", [
+    ({'exc': requests.exceptions.RequestException("Network error")}, requests.exceptions.RequestException),
+    ({'text': 'Invalid JSON'}, json.JSONDecodeError),
+], ids=["network", "json"])
+def test_error_handling(provider, requests_mock, reply, error):
+    """Test error handling"""
+    requests_mock.get(NEWSAPI_URL, **reply)
+
+    with pytest.raises(error):
+        provider.fetch_news()
+    assert not provider.is_available
+    if 'exc' in reply:
+        assert "Network error" in provider.last_error
+
+def test_provider_availability(provider):
+    """Test provider availability checks"""
+    # Test with API key
+    assert provider.is_available
+
+    # Test without API key
+    provider = NewsAPIProvider()  # Reinitialize to trigger check
+    assert not provider.is_available
+    assert "API key not found" in provider.last_error
+
+def test_category_filtering(provider, api_mock):
+    """Test category filtering in requests"""
+    requests_mock = api_mock({'articles': []}, url=NEWSAPI_URL)
+
+    # Test with technology category
+    provider.fetch_news('technology')
+    assert requests_mock.last_request.qs['category'] == ['technology']
+
+    # Test with unknown category
+    provider.fetch_news('unknown')
+    assert 'category' not in requests_mock.last_request.qs
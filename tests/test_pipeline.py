@@ -3,41 +3,59 @@ Test suite for the news automation pipeline
 """
 import unittest
 import os
-import json
-import sys
+import copy
+import orjson
 from pathlib import Path
+from unittest.mock import patch
 from datetime import datetime
-sys.path.append(str(Path(__file__).parent.parent))
 
 from src.core.news_fetcher import NewsFetcher
 from src.core.ai_generator import AIGenerator
 # Cache functionality removed
 from src.orchestrator import NewsOrchestrator
 
+_TEST_DATA_PATH = Path(__file__).with_name('test_data.json')
+
 def load_test_data():
     """Load test data from JSON file"""
-    test_data_path = os.path.join(os.path.dirname(__file__), 'test_data.json')
-    with open(test_data_path, 'r') as f:
-        return json.load(f)
+    return orjson.loads(_TEST_DATA_PATH.read_bytes())
+
+# Canned AI results for the test articles, keyed by a word in their title
+_SUMMARIES = {
+    'quantum': ("A breakthrough in quantum computing using AI for error correction.",
+                'technology', True),
+    'battery': ("New battery technology extends phone battery life significantly.",
+                'technology', False),
+}
+
+def _mock_summarize(article):
+    """Stand-in for AIGenerator.summarize_article"""
+    title = article['title'].lower()
+    for keyword, result in _SUMMARIES.items():
+        if keyword in title:
+            return result
+    return (article['description'], 'general', False)
 
 class TestNewsPipeline(unittest.TestCase):
-    def setUp(self):
-        """Set up test environment"""
-        # Ensure we have required environment variables
-        os.environ['NEWS_API_KEY'] = os.getenv('NEWS_API_KEY', 'test_key')
-        self.news_fetcher = NewsFetcher()
-        self.ai_generator = AIGenerator()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once; tests patch methods only within a with block"""
+        # Ensure we have required environment variables, restored when the class finishes
+        env = patch.dict(os.environ, {'NEWS_API_KEY': os.getenv('NEWS_API_KEY', 'test_key')})
+        env.start()
+        cls.addClassCleanup(env.stop)
+        cls.news_fetcher = NewsFetcher()
+        cls.ai_generator = AIGenerator()
         # Cache functionality removed
-        self.orchestrator = NewsOrchestrator()
+        cls.orchestrator = NewsOrchestrator()
+        cls.test_data = load_test_data()
 
     def test_news_fetcher(self):
         """Test news fetching with mock data"""
-        test_data = load_test_data()
-        # Monkey patch the fetch_news method to return test data
-        original_fetch = self.news_fetcher.fetch_news
-        self.news_fetcher.fetch_news = lambda category: test_data.get(category, [])
-        
-        try:
+        test_data = self.test_data
+        # Patch the fetch_news method to return test data
+        with patch.object(self.news_fetcher, 'fetch_news',
+                          side_effect=lambda category: test_data.get(category, [])):
             # Test technology news
             tech_articles = self.news_fetcher.fetch_news('technology')
             self.assertEqual(len(tech_articles), 2)
@@ -48,33 +66,15 @@ class TestNewsPipeline(unittest.TestCase):
             business_articles = self.news_fetcher.fetch_news('business')
             self.assertEqual(len(business_articles), 1)
             self.assertEqual(business_articles[0]['source']['name'], 'Bloomberg')
-        finally:
-            # Restore original method
-            self.news_fetcher.fetch_news = original_fetch
 
     def test_ai_generator(self):
         """Test AI summarization with real article data"""
-        test_data = load_test_data()
+        test_data = self.test_data
         quantum_article = test_data['technology'][0]
         battery_article = test_data['technology'][1]
         
         # Mock the AI generator response
-        def mock_summarize(article):
-            if 'quantum' in article['title'].lower():
-                return ("A breakthrough in quantum computing using AI for error correction.", 
-                       'technology', True)
-            elif 'battery' in article['title'].lower():
-                return ("New battery technology extends phone battery life significantly.", 
-                       'technology', False)
-            return (article['description'], 'general', False)
-            
-        # Save original method
-        original_summarize = self.ai_generator.summarize_article
-        
-        try:
-            # Replace with mock
-            self.ai_generator.summarize_article = mock_summarize
-            
+        with patch.object(self.ai_generator, 'summarize_article', side_effect=_mock_summarize):
             # Test quantum computing article
             summary1, category1, is_breaking1 = self.ai_generator.summarize_article(quantum_article)
             self.assertIsInstance(summary1, str)
@@ -89,13 +89,10 @@ class TestNewsPipeline(unittest.TestCase):
             self.assertEqual(category2, 'technology')
             # Breaking news status may vary, so we just check the type
             self.assertIsInstance(is_breaking2, bool)
-        finally:
-            # Restore original method
-            self.ai_generator.summarize_article = original_summarize
 
     def test_news_data_structure(self):
         """Test news data structure and sorting"""
-        test_data = load_test_data()
+        test_data = self.test_data
         tech_articles = test_data['technology']
         
         # Test article structure
@@ -119,31 +116,17 @@ class TestNewsPipeline(unittest.TestCase):
 
     def test_news_processing(self):
         """Test end-to-end news processing with real data"""
-        test_data = load_test_data()
+        # Processing annotates the articles, so work on a copy of the shared data
+        test_data = copy.deepcopy(self.test_data)
         
         # Test data processing without cache
         
-        # Monkey patch the news fetcher and AI generator
-        original_fetch = self.news_fetcher.fetch_news
-        original_summarize = self.ai_generator.summarize_article
         # Mock news fetcher to only return technology articles
-        self.news_fetcher.fetch_news = lambda requested_category: (
-            test_data['technology'] if requested_category == 'technology' else []
-        )
-        
-        def mock_summarize(article):
-            # Return pre-defined summaries for our test articles
-            if 'quantum' in article['title'].lower():
-                return ("A breakthrough in quantum computing using AI for error correction.", 
-                       'technology', True)
-            elif 'battery' in article['title'].lower():
-                return ("New battery technology extends phone battery life significantly.", 
-                       'technology', False)
-            # Default case should not occur in our test
-            return (article['description'], 'general', False)
-        self.ai_generator.summarize_article = mock_summarize
+        def mock_fetch(requested_category):
+            return test_data['technology'] if requested_category == 'technology' else []
         
-        try:
+        with patch.object(self.news_fetcher, 'fetch_news', side_effect=mock_fetch), \
+             patch.object(self.ai_generator, 'summarize_article', side_effect=_mock_summarize):
             # Process technology news
             articles = self.orchestrator.process_news('technology')
             
@@ -176,10 +159,6 @@ class TestNewsPipeline(unittest.TestCase):
             for field in required_fields:
                 self.assertIn(field, article)
                 self.assertIn(field, article2)
-        finally:
-            # Restore original methods
-            self.news_fetcher.fetch_news = original_fetch
-            self.ai_generator.summarize_article = original_summarize
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,13 +8,9 @@ from src.core.gdelt_provider import GdeltNewsProvider
 from src.core.guardian_provider import GuardianNewsProvider
 from src.core.newsapi_provider import NewsAPIProvider
 from src.core.provider_manager import NewsProviderManager
+from tests.test_utils import VALID_CATEGORIES
 
-@pytest.fixture
-def provider_manager():
-    """Set up provider manager with all providers"""
-    return NewsProviderManager(use_cache=False)
-
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def setup_env():
     """Set up environment variables before tests"""
     os.environ["GUARDIAN_API_KEY"] = "c3c7df8a-61dc-403f-8c26-dc5a6546c782"
@@ -24,14 +20,22 @@ def setup_env():
     os.environ.pop("GUARDIAN_API_KEY", None)
     os.environ.pop("NEWS_API_KEY", None)
 
-@pytest.fixture
-def providers():
-    """Set up individual providers for testing"""
-    return {
+@pytest.fixture(scope="module")
+def provider_manager(setup_env):
+    """Set up provider manager with all providers"""
+    return NewsProviderManager(use_cache=False)
+
+@pytest.fixture(scope="module")
+def providers(setup_env, shared_session):
+    """Set up individual providers once; tests that disable one restore it"""
+    providers = {
         'gdelt': GdeltNewsProvider(),
         'guardian': GuardianNewsProvider(),
         'newsapi': NewsAPIProvider()
     }
+    for provider in providers.values():
+        provider.session = shared_session
+    return providers
 
 def validate_article(article):
     """Validate article structure"""
@@ -84,22 +88,22 @@ class TestProvidersIntegration:
         # Force first provider to fail
         provider_manager.providers[0].is_available = False
         
-        # Should automatically switch to next provider
-        articles = provider_manager.fetch_news(category='technology')
-        assert len(articles) > 0, "Failover should provide articles"
-        assert all(validate_article(article) for article in articles)
+        try:
+            # Should automatically switch to next provider
+            articles = provider_manager.fetch_news(category='technology')
+            assert len(articles) > 0, "Failover should provide articles"
+            assert all(validate_article(article) for article in articles)
+        finally:
+            provider_manager.providers[0].is_available = True
     
-    def test_category_mapping(self, providers):
+    @pytest.mark.parametrize("category", sorted(VALID_CATEGORIES))
+    @pytest.mark.parametrize("name", ['gdelt', 'guardian', 'newsapi'])
+    def test_category_mapping(self, providers, name, category):
         """Test category mapping across providers"""
-        categories = ['technology', 'business', 'science', 'sports', 
-                     'entertainment', 'politics', 'general']
-        
-        for name, provider in providers.items():
-            for category in categories:
-                articles = provider.fetch_news(category=category)
-                if articles:  # Some categories might not have articles
-                    assert all(article['category'] == category for article in articles), \
-                        f"{name} provider returned articles with wrong category"
+        articles = providers[name].fetch_news(category=category)
+        if articles:  # Some categories might not have articles
+            assert all(article['category'] == category for article in articles), \
+                f"{name} provider returned articles with wrong category"
     
     @pytest.mark.vcr
     def test_provider_error_handling(self, providers):
@@ -112,9 +116,10 @@ class TestProvidersIntegration:
             try:
                 with pytest.raises(Exception):
                     provider.fetch_news()
+                    
+                assert not provider.is_available, f"{name} provider should be marked as unavailable after error"
+                assert provider.last_error is not None, f"{name} provider should record error message"
             finally:
-                # Restore original URL
+                # Restore original URL and availability for the rest of the module
                 provider.base_url = original_url
-                
-            assert not provider.is_available, f"{name} provider should be marked as unavailable after error"
-            assert provider.last_error is not None, f"{name} provider should record error message"
+                provider.mark_available()
@@ -9,6 +9,21 @@ from typing import Dict, Any, List
 import pytest
 from unittest.mock import MagicMock
 
+# Shared by the pytest vcr_config fixture and unittest-style cassette decorators
+VCR_CONFIG = {
+    'filter_headers': ['authorization', 'api-key', 'x-api-key'],  # Don't record API keys
+    'filter_query_parameters': ['apiKey'],
+    'record_mode': 'once',
+    'cassette_library_dir': os.path.join(os.path.dirname(__file__), 'cassettes'),
+    # JSON cassettes load much faster than VCR's default YAML
+    'serializer': 'json',
+    'match_on': ['method', 'scheme', 'host', 'path', 'query']
+}
+
+# Categories a provider may map its own sections/themes onto
+VALID_CATEGORIES = frozenset({'technology', 'business', 'science', 'sports',
+                              'entertainment', 'politics', 'general'})
+
 def create_test_article(
     title: str = "Test Article",
     category: str = "technology",
@@ -85,6 +100,17 @@ def setup_test_env(monkeypatch):
         monkeypatch.setenv(key, value)
     return test_env
 
+class FakeClock:
+    """Manually advanced time source for rate limiter and cache tests"""
+    def __init__(self, start: float = 0.0):
+        self.t = start
+
+    def __call__(self) -> float:
+        return self.t
+
+    def advance(self, seconds: float) -> None:
+        self.t += seconds
+
 class MockResponse:
     """Mock HTTP response"""
     def __init__(self, json_data: Dict[str, Any], status_code: int = 200):
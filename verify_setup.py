@@ -2,7 +2,7 @@
 Verify setup and test news automation
 """
 import os
-import json
+import orjson
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -33,14 +33,13 @@ def verify_setup():
     news_file = 'public/data/news.json'
     if os.path.exists(news_file):
         try:
-            with open(news_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = orjson.loads(Path(news_file).read_bytes())
             if isinstance(data, list):
                 print(f"✅ news.json exists with {len(data)} articles")
             else:
                 print("❌ news.json has invalid format")
                 return False
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             print("❌ news.json is not valid JSON")
             return False
     else: